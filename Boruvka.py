@@ -0,0 +1,185 @@
+""" File:  Boruvka.py
+Contains a parallel version of Boruvka's minimum spanning tree algorithm over the graph
+classes in Graph.py. The edges live in shared memory, and every round a pool of worker
+processes each scan their own slice of them for the cheapest edge leaving each component
+"""
+
+import multiprocessing
+import os
+from array import array
+from multiprocessing.sharedctypes import RawArray
+
+from Graph import weightArray
+from Kruskal import DisjointSet, orientForest
+
+# Each worker gets this many slices of the edge arrays per round, so that a slice whose edges
+# have mostly been contracted away does not leave its worker idle
+CHUNKS_PER_PROCESS = 4
+
+# The shared edge and component arrays, as seen from inside a worker process
+workerArrays = None
+
+
+def BoruvkaMST(G, A, processes=None):
+    """
+    Takes in a graph G and a starting vertex A, and builds a minimum spanning tree in rounds.
+    Each round finds the cheapest edge leaving every component and adds them all at once, which
+    at least halves the number of components, so there are at most log2(V) rounds. Edges found
+    to be inside a component are dropped from the arrays, so later rounds scan fewer edges.
+    The result is the same predecessor list that PrimMST returns, with one tree per component
+    on a disconnected graph like KruskalMST.
+    :param G: A Graph or CSRGraph
+    :param A: Node data of the starting vertex
+    :param processes: Number of worker processes, by default one per CPU. With 1 the scans
+    run in this process and no pool is started
+    :return: A list holding the predecessor of each vertex in the tree, None for the roots
+    """
+    n = G.getSize()
+    start = G.findNode(A)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    sources = []
+    dests = []
+    weights = []
+    for u in range(n):
+        for (v, weight) in G.iterNeighbors(u):
+            if u < v:
+                sources.append(u)
+                dests.append(v)
+                weights.append(weight)
+    m = len(sources)
+    sources = array('q', sources)
+    dests = array('q', dests)
+    weights = weightArray(weights)
+    weightCode = weights.typecode
+
+    # Shared arrays, filled here and read (and compacted) by the workers
+    sharedSources = RawArray('q', max(m, 1))
+    sharedDests = RawArray('q', max(m, 1))
+    sharedWeights = RawArray(weightCode, max(m, 1))
+    sharedComp = RawArray('q', max(n, 1))
+    arrays = (sharedSources, sharedDests, sharedWeights, sharedComp)
+    localSources, localDests, localWeights, comp = viewArrays(arrays, weightCode)
+    localSources[:m] = memoryview(sources)
+    localDests[:m] = memoryview(dests)
+    localWeights[:m] = memoryview(weights)
+    for x in range(n):
+        comp[x] = x
+    del sources, dests, weights
+
+    numChunks = max(1, processes * CHUNKS_PER_PROCESS)
+    chunkSize = -(-m // numChunks)
+    chunks = [[i, min(chunkSize, m - i)] for i in range(0, m, max(chunkSize, 1))]
+
+    sets = DisjointSet(n)
+    treeAdj = [[] for i in range(n)]
+    pool = None
+    if processes > 1 and m > 0:
+        pool = multiprocessing.Pool(processes, initializer=attachArrays,
+                                    initargs=(arrays, weightCode))
+    else:
+        attachArrays(arrays, weightCode)
+    try:
+        while chunks:
+            if pool is not None:
+                results = pool.map(scanChunk, [tuple(chunk) for chunk in chunks])
+            else:
+                results = [scanChunk(tuple(chunk)) for chunk in chunks]
+
+            # Merge the per-slice answers into the cheapest edge out of each component
+            cheapest = {}
+            for (chunk, (length, best)) in zip(chunks, results):
+                chunk[1] = length
+                for (c, edge) in best.items():
+                    current = cheapest.get(c)
+                    if current is None or edge < current:
+                        cheapest[c] = edge
+            if not cheapest:
+                break
+
+            # Ties are broken on the whole (weight, u, v) tuple, so the chosen edges never close
+            # a cycle, but two components can pick the same edge; union skips the repeat
+            for (weight, u, v) in cheapest.values():
+                if sets.union(u, v):
+                    treeAdj[u].append(v)
+                    treeAdj[v].append(u)
+
+            # Contract: relabel every vertex with its component before the next round
+            find = sets.find
+            for x in range(n):
+                comp[x] = find(x)
+            chunks = [chunk for chunk in chunks if chunk[1] > 0]
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        attachArrays(None, None)
+        for view in (localSources, localDests, localWeights, comp):
+            view.release()
+    return orientForest(treeAdj, start)
+
+
+def viewArrays(arrays, weightCode):
+    """
+    Wraps the shared edge and component arrays in typed memoryviews, which index much faster
+    than the ctypes arrays themselves
+    :param arrays: The (sources, dests, weights, comp) shared arrays
+    :param weightCode: The typecode of the weights array
+    :return: A tuple of four memoryviews over the same memory
+    """
+    sources, dests, weights, comp = arrays
+    return (memoryview(sources).cast('B').cast('q'),
+            memoryview(dests).cast('B').cast('q'),
+            memoryview(weights).cast('B').cast(weightCode),
+            memoryview(comp).cast('B').cast('q'))
+
+
+def attachArrays(arrays, weightCode):
+    """
+    Pool initializer: keeps views of the shared arrays for scanChunk to use in this process
+    :param arrays: The (sources, dests, weights, comp) shared arrays, or None to let go of them
+    :param weightCode: The typecode of the weights array
+    :return:
+    """
+    global workerArrays
+    if arrays is None:
+        workerArrays = None
+    else:
+        workerArrays = viewArrays(arrays, weightCode)
+
+
+def scanChunk(chunk):
+    """
+    Scans one slice of the shared edge arrays. Finds the cheapest edge leaving each component
+    that appears in the slice, and at the same time packs the edges that still join two
+    different components to the front of the slice, dropping the ones inside a component.
+    :param chunk: A (start, length) pair giving the slice to scan
+    :return: The new length of the slice, and a dictionary from component to its cheapest
+    (weight, u, v) edge
+    """
+    start, length = chunk
+    sources, dests, weights, comp = workerArrays
+    best = {}
+    write = start
+    for i in range(start, start + length):
+        u = sources[i]
+        v = dests[i]
+        cu = comp[u]
+        cv = comp[v]
+        if cu == cv:
+            continue
+        weight = weights[i]
+        if write != i:
+            sources[write] = u
+            dests[write] = v
+            weights[write] = weight
+        write += 1
+        edge = (weight, u, v)
+        current = best.get(cu)
+        if current is None or edge < current:
+            best[cu] = edge
+        current = best.get(cv)
+        if current is None or edge < current:
+            best[cv] = edge
+    return write - start, best
@@ -0,0 +1,257 @@
+""" File:  DynamicMST.py
+Contains a minimum spanning forest that is kept up to date as edges are added to and
+removed from a Graph, instead of being rebuilt from scratch after every change
+"""
+
+from Kruskal import DisjointSet, orientForest
+
+
+class DynamicMST:
+    """A minimum spanning forest bound to a Graph. Edges added and removed through this
+    object go into the graph and also update the forest in place: a new edge swaps out
+    the heaviest edge on the cycle it closes, and removing a tree edge only searches the
+    smaller of the two pieces it leaves for a replacement. Changes made to the graph
+    directly are not seen until rebuild is called."""
+
+    __slots__ = ('graph', 'treeAdj', 'parent', 'parentWeight', 'totalWeight', 'numTreeEdges')
+
+    def __init__(self, G):
+        """
+        Builds the starting forest of G with Kruskal's algorithm
+        :param G: A Graph, which is changed by addEdge and removeEdge
+        """
+        self.graph = G
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Throws the forest away and builds it again from the whole graph, for after the graph
+        has been changed without going through this object
+        :return:
+        """
+        G = self.graph
+        n = G.getSize()
+        edges = []
+        for u in range(n):
+            for (v, weight) in G.iterNeighbors(u):
+                if u < v:
+                    edges.append((weight, u, v))
+        edges.sort()
+
+        sets = DisjointSet(n)
+        # Each tree edge is in both endpoints' dictionaries, mapped to its weight
+        self.treeAdj = [{} for i in range(n)]
+        self.totalWeight = 0
+        self.numTreeEdges = 0
+        for (weight, u, v) in edges:
+            if sets.union(u, v):
+                self.treeAdj[u][v] = weight
+                self.treeAdj[v][u] = weight
+                self.totalWeight += weight
+                self.numTreeEdges += 1
+                if self.numTreeEdges == n - 1:
+                    break
+
+        # The forest is also kept as parent pointers, to find tree paths by walking upward
+        self.parent = orientForest(self.treeAdj, 0) if n > 0 else []
+        self.parentWeight = [None] * n
+        for v in range(n):
+            if self.parent[v] is not None:
+                self.parentWeight[v] = self.treeAdj[v][self.parent[v]]
+
+    def addEdge(self, node1, node2, weight):
+        """
+        Adds an edge to the graph and updates the forest. If the nodes are in different trees
+        the edge joins them; otherwise it closes a cycle, and if it is lighter than the heaviest
+        tree edge on that cycle it takes that edge's place. Takes time in proportion to the
+        depth of the two nodes in their tree.
+        :param node1: Node number for first node of the edge
+        :param node2: Node number for second node of the edge
+        :param weight: Weight of the edge
+        :return: True if the forest changed, False if not
+        """
+        self.graph.addEdge(node1, node2, weight)
+        if node1 == node2:
+            return False
+        paths = self.treePath(node1, node2)
+        if paths is None:
+            self.link(node1, node2, weight)
+            return True
+
+        # Find the heaviest tree edge on the cycle; each edge is named by its lower end
+        parentWeight = self.parentWeight
+        heaviest = None
+        below1 = True
+        for (path, onSide1) in ((paths[0], True), (paths[1], False)):
+            for x in path:
+                if heaviest is None or parentWeight[x] > parentWeight[heaviest]:
+                    heaviest = x
+                    below1 = onSide1
+        if not parentWeight[heaviest] > weight:
+            return False
+
+        # Cutting the heaviest edge leaves the node on its side of the path in the piece below
+        # the cut, and that piece is hung from the other node through the new edge
+        self.cut(heaviest)
+        if below1:
+            self.link(node1, node2, weight)
+        else:
+            self.link(node2, node1, weight)
+        return True
+
+    def removeEdge(self, node1, node2):
+        """
+        Removes any edge between two nodes from the graph and updates the forest. If a tree
+        edge went, the smaller of the two pieces it leaves is searched for the lightest graph
+        edge back to the other piece, which takes its place.
+        :param node1: First node number of edge to be removed
+        :param node2: Second node number of edge to be removed
+        :return: True if the edge was there and was removed, and False if no edge was there
+        """
+        if not self.graph.removeEdge(node1, node2):
+            return False
+        if node1 == node2 or node2 not in self.treeAdj[node1]:
+            return True
+        if self.parent[node1] == node2:
+            self.cut(node1)
+        else:
+            self.cut(node2)
+
+        side = self.smallerSide(node1, node2)
+        best = None
+        for x in side:
+            for (y, weight) in self.graph.iterNeighbors(x):
+                if y not in side and (best is None or weight < best[0]):
+                    best = (weight, x, y)
+        if best is not None:
+            weight, x, y = best
+            self.link(x, y, weight)
+        return True
+
+    def getMST(self, A):
+        """
+        Returns the forest as a predecessor list, the same shape PrimMST and KruskalMST return:
+        the tree holding A hangs from A, and every other tree from its lowest numbered vertex
+        :param A: Node data of the starting vertex
+        :return: A list holding the predecessor of each vertex in the tree, None for the roots
+        """
+        return orientForest(self.treeAdj, self.graph.findNode(A))
+
+    def getTotalWeight(self):
+        """Returns the total weight of the edges in the forest"""
+        return self.totalWeight
+
+    def getTreeEdges(self):
+        """Returns the edges of the forest as a list of (node1, node2, weight) tuples"""
+        edges = []
+        for v in range(len(self.parent)):
+            if self.parent[v] is not None:
+                edges.append((v, self.parent[v], self.parentWeight[v]))
+        return edges
+
+    def isTreeEdge(self, node1, node2):
+        """Returns True if the edge between the two nodes is in the forest, False if not"""
+        return node2 in self.treeAdj[node1]
+
+    def treePath(self, node1, node2):
+        """
+        Finds the tree path between two nodes by walking up from each to where they meet
+        :param node1: Node number of one end
+        :param node2: Node number of the other end
+        :return: Two lists of the nodes whose parent edge is on the path, those on node1's side
+        of the meeting point and those on node2's side, or None if the nodes are in different trees
+        """
+        parent = self.parent
+        up1 = {}
+        x = node1
+        while x is not None:
+            up1[x] = len(up1)
+            x = parent[x]
+        path2 = []
+        x = node2
+        while x not in up1:
+            path2.append(x)
+            x = parent[x]
+            if x is None:
+                return None
+        path1 = list(up1)[:up1[x]]
+        return path1, path2
+
+    def cut(self, node):
+        """
+        Removes the tree edge between node and its parent, so node becomes the root of its piece
+        :param node: Node number whose parent edge is removed
+        :return:
+        """
+        above = self.parent[node]
+        weight = self.treeAdj[node].pop(above)
+        del self.treeAdj[above][node]
+        self.parent[node] = None
+        self.parentWeight[node] = None
+        self.totalWeight -= weight
+        self.numTreeEdges -= 1
+
+    def link(self, node1, node2, weight):
+        """
+        Joins two different trees with a tree edge, making node1 the root of its tree first
+        and then hanging it under node2
+        :param node1: Node number in the tree that gets re-rooted
+        :param node2: Node number in the other tree
+        :param weight: Weight of the new tree edge
+        :return:
+        """
+        self.reroot(node1)
+        self.parent[node1] = node2
+        self.parentWeight[node1] = weight
+        self.treeAdj[node1][node2] = weight
+        self.treeAdj[node2][node1] = weight
+        self.totalWeight += weight
+        self.numTreeEdges += 1
+
+    def reroot(self, node):
+        """
+        Makes node the root of its tree by turning around the parent pointers on its path up
+        :param node: Node number to become the root
+        :return:
+        """
+        parent = self.parent
+        parentWeight = self.parentWeight
+        prev = None
+        prevWeight = None
+        x = node
+        while x is not None:
+            nextNode = parent[x]
+            nextWeight = parentWeight[x]
+            parent[x] = prev
+            parentWeight[x] = prevWeight
+            prev = x
+            prevWeight = nextWeight
+            x = nextNode
+
+    def smallerSide(self, node1, node2):
+        """
+        Explores the trees holding two nodes one step at a time each, and stops as soon as one
+        of them is finished, so the work is in proportion to the smaller tree
+        :param node1: Node number in the first tree
+        :param node2: Node number in the second tree
+        :return: The set of node numbers in whichever tree was smaller
+        """
+        treeAdj = self.treeAdj
+        seen1 = {node1}
+        seen2 = {node2}
+        stack1 = [node1]
+        stack2 = [node2]
+        while stack1 and stack2:
+            x = stack1.pop()
+            for y in treeAdj[x]:
+                if y not in seen1:
+                    seen1.add(y)
+                    stack1.append(y)
+            x = stack2.pop()
+            for y in treeAdj[x]:
+                if y not in seen2:
+                    seen2.add(y)
+                    stack2.append(y)
+        if not stack1:
+            return seen1
+        return seen2
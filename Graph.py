@@ -2,9 +2,19 @@
 Author:  Susan Fox
 Date: September 2020
 
-Contains an weighted adjacency list class
+Contains an weighted adjacency list class, and a frozen compressed sparse row
+version of it for large graphs
 """
 
+import csv
+import math
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+
 
 
 # ======================================================================
@@ -13,7 +23,10 @@ class Graph:
     """A graph contains vertices and edges, this particular one is a weighted,
     adjacency-list implementation"""
 
-    def __init__(self, n, nodeData = None):
+    __slots__ = ('numVerts', 'numEdges', 'nodeData', 'lastNode', 'nodeIndex', 'adjList',
+                 'edgeIndex', 'version')
+
+    def __init__(self, n, nodeData = None, indexEdges = False):
         """
         Takes in the number of vertices, and an optional list of data the same length,
         and constructs the adjacency list representation of the data. Node data might
@@ -21,19 +34,31 @@ class Graph:
         0 through n-1, same order as the nodeData
         :param n: The number of vertices in the graph
         :param nodeData: An optional list of labels/data to attach to each vertex
+        :param indexEdges: If True, also keep a hash index of the edges so that getWeight
+        and areNeighbors take constant time instead of scanning an adjacency list
         """
         self.numVerts = n
+        self.numEdges = 0
+        # Goes up by one with every change to the node data or edges, so results worked out
+        # from the graph can tell whether they are still current
+        self.version = 0
         if nodeData is None:
             self.nodeData = list(range(n))
-            self.lastData = 0
+            self.lastNode = 0
         else:
             self.nodeData = nodeData
             self.lastNode = len(nodeData)
+        # Maps node data to node number, so findNode does not have to search nodeData
+        self.nodeIndex = buildNodeIndex(self.nodeData)
 
         self.adjList = []
         for i in range(n):
             self.adjList.append(list())
 
+        self.edgeIndex = None
+        if indexEdges:
+            self.buildEdgeIndex()
+
 
     # -----------------------------------------------------------------
     # First, some operations for adding vertex data and edges to the graph
@@ -50,9 +75,20 @@ class Graph:
             # if no more available nodes, return an error code
             raise GraphFullException()
         else:
-            self.nodeData[self.lastNode] = nodeData
             nodePos = self.lastNode
+            if self.nodeIndex is not None:
+                oldData = self.nodeData[nodePos]
+                if self.nodeIndex.get(oldData) == nodePos:
+                    del self.nodeIndex[oldData]
+                try:
+                    if self.nodeIndex.get(nodeData, nodePos) >= nodePos:
+                        self.nodeIndex[nodeData] = nodePos
+                except TypeError:
+                    # Unhashable node data, so fall back to searching the list
+                    self.nodeIndex = None
+            self.nodeData[nodePos] = nodeData
             self.lastNode += 1
+            self.version += 1
             return nodePos
 
 
@@ -67,31 +103,112 @@ class Graph:
         if node1 < self.numVerts and node2 < self.numVerts:
             self.adjList[node1].append((node2, weight))
             self.adjList[node2].append((node1, weight))
+            if self.edgeIndex is not None:
+                # Like the list scan, the index answers with the first edge added between two nodes
+                self.edgeIndex[node1].setdefault(node2, weight)
+                self.edgeIndex[node2].setdefault(node1, weight)
+            self.numEdges += 1
+            self.version += 1
             return True
         elif node1 >= self.numVerts:
             raise NodeIndexOutOfRangeException(0, self.numVerts, node1)
         else:
             raise NodeIndexOutOfRangeException(0, self.numVerts, node2)
 
-    
+    def addEdges(self, edges):
+        """
+        Takes an iterable of (node1, node2, weight) triples and adds an edge for each, like calling
+        addEdge on each one but without the per-call overhead. If a node number is out of range,
+        the edges before it have already been added when the exception is raised.
+        :param edges: An iterable of (node1, node2, weight) tuples, using node numbers
+        :return: The number of edges added
+        """
+        n = self.numVerts
+        adjList = self.adjList
+        edgeIndex = self.edgeIndex
+        count = 0
+        try:
+            for (node1, node2, weight) in edges:
+                if node1 >= n:
+                    raise NodeIndexOutOfRangeException(0, n, node1)
+                if node2 >= n:
+                    raise NodeIndexOutOfRangeException(0, n, node2)
+                adjList[node1].append((node2, weight))
+                adjList[node2].append((node1, weight))
+                if edgeIndex is not None:
+                    edgeIndex[node1].setdefault(node2, weight)
+                    edgeIndex[node2].setdefault(node1, weight)
+                count += 1
+        finally:
+            self.numEdges += count
+            if count > 0:
+                self.version += 1
+        return count
+
+    def addEdgeArrays(self, sources, dests, weights):
+        """
+        Takes three parallel sequences (lists, arrays, or anything indexable) and adds the edge
+        (sources[k], dests[k], weights[k]) for every k.
+        :param sources: Node numbers for the first node of each edge
+        :param dests: Node numbers for the second node of each edge
+        :param weights: The weight of each edge
+        :return: The number of edges added
+        """
+        if not len(sources) == len(dests) == len(weights):
+            raise ValueError("Edge arrays must all be the same length")
+        return self.addEdges(zip(sources, dests, weights))
+
+    def loadEdgeList(self, path, delimiter=None, labels=True, weightType=float,
+                     chunkSize=65536, skipHeader=False):
+        """
+        Reads edges from a CSV or TSV file and adds them to the graph, a chunk of lines at a
+        time so the whole file is never held in memory. Each line holds the two ends of an edge
+        and optionally its weight (1 if missing). Blank lines and lines starting with # are skipped.
+        :param path: Name of the edge-list file
+        :param delimiter: Column separator, by default a tab for .tsv files and a comma otherwise
+        :param labels: If True the ends are node data looked up with findNodes, otherwise node numbers
+        :param weightType: Function that turns the weight column text into a weight
+        :param chunkSize: The number of edges to read before adding them to the graph
+        :param skipHeader: If True, the first line of the file is ignored
+        :return: The number of edges added
+        """
+        if labels:
+            resolve = self.findNodes
+        else:
+            resolve = None
+        count = 0
+        for (sources, dests, weights) in readEdgeList(path, resolve, delimiter, weightType,
+                                                      chunkSize, skipHeader):
+            count += self.addEdgeArrays(sources, dests, weights)
+        return count
 
     def removeEdge(self, node1, node2):
         """
         Takes two nodes and removes any edge between them.  It returns
         True if the edge was there and was removed, and False if no edge was there.
+        Each adjacency list is rebuilt in a single pass, so this is O(degree).
         :param node1: First node number of edge to be removed
         :param node2: Second node number of edge to be removed
         :return:
         """
         if node1 < self.numVerts and node2 < self.numVerts:
             lst1 = self.adjList[node1]
-            lst2 = self.adjList[node2]
-            for (n, w) in lst1:
-                if node2 == n:
-                    lst1.remove((n, w))
-            for (n, w) in lst2:
-                if node1 == n:
-                    lst2.remove((n, w))
+            kept = [edge for edge in lst1 if edge[0] != node2]
+            removed = len(lst1) - len(kept)
+            if removed == 0:
+                return False
+            lst1[:] = kept
+            if node1 == node2:
+                # A self loop puts two entries in the same list
+                removed = removed // 2
+            else:
+                lst2 = self.adjList[node2]
+                lst2[:] = [edge for edge in lst2 if edge[0] != node1]
+            if self.edgeIndex is not None:
+                self.edgeIndex[node1].pop(node2, None)
+                self.edgeIndex[node2].pop(node1, None)
+            self.numEdges -= removed
+            self.version += 1
             return True
         elif node1 >= self.numVerts:
             raise NodeIndexOutOfRangeException(0, self.numVerts, node1)
@@ -99,6 +216,57 @@ class Graph:
             raise NodeIndexOutOfRangeException(0, self.numVerts, node2)
 
 
+    def buildEdgeIndex(self):
+        """
+        Builds the hash index of edges from the current adjacency lists, turning on constant-time
+        getWeight and areNeighbors. Once built, addEdge and removeEdge keep it up to date. Costs
+        one dictionary entry per directed edge.
+        :return:
+        """
+        self.edgeIndex = []
+        for lst in self.adjList:
+            index = {}
+            for (n, w) in lst:
+                index.setdefault(n, w)
+            self.edgeIndex.append(index)
+
+    def removeEdges(self, pairs):
+        """
+        Takes an iterable of (node1, node2) pairs and removes every edge between each pair. The
+        pairs are grouped by node first, so each touched adjacency list is compacted only once,
+        however many of its edges go. Nothing is removed if any node number is out of range.
+        :param pairs: An iterable of (node1, node2) tuples, using node numbers
+        :return: The number of edges removed
+        """
+        n = self.numVerts
+        drop = {}
+        for (node1, node2) in pairs:
+            if node1 >= n:
+                raise NodeIndexOutOfRangeException(0, n, node1)
+            if node2 >= n:
+                raise NodeIndexOutOfRangeException(0, n, node2)
+            drop.setdefault(node1, set()).add(node2)
+            drop.setdefault(node2, set()).add(node1)
+
+        removedEntries = 0
+        edgeIndex = self.edgeIndex
+        for (node, neighbors) in drop.items():
+            lst = self.adjList[node]
+            kept = [edge for edge in lst if edge[0] not in neighbors]
+            removedEntries += len(lst) - len(kept)
+            lst[:] = kept
+            if edgeIndex is not None:
+                index = edgeIndex[node]
+                for neighbor in neighbors:
+                    index.pop(neighbor, None)
+        # Every edge, self loops included, has exactly two adjacency list entries
+        removed = removedEntries // 2
+        self.numEdges -= removed
+        if removed > 0:
+            self.version += 1
+        return removed
+
+
 
     # ---------------------------------------------------------
     # Next, accessors of different sorts
@@ -114,7 +282,20 @@ class Graph:
         Returns a range containing the node numbers for the graph
         """
         return range(self.numVerts)
-    
+
+    def getEdges(self):
+        """
+        Returns the current number of edges in the graph
+        """
+        return self.numEdges
+
+    def getVersion(self):
+        """
+        Returns the version number of the graph, which goes up whenever node data or edges
+        are added or removed
+        """
+        return self.version
+
     
     def getData(self, node):
         """
@@ -136,11 +317,40 @@ class Graph:
         :param data: The data item to look for
         :return:
         """
+        if self.nodeIndex is not None:
+            try:
+                return self.nodeIndex[data]
+            except KeyError:
+                raise NoSuchNodeException(data)
+            except TypeError:
+                pass
         if data in self.nodeData:
             return self.nodeData.index(data)
         else:
             raise NoSuchNodeException(data)
 
+    def findNodes(self, dataItems):
+        """
+        Takes in many data items at once, and returns the node index for each of them, in order.
+        Raises an exception for the first data item that is not in the graph
+        :param dataItems: An iterable of data items to look for
+        :return: A new list of node indices
+        """
+        nodeIndex = self.nodeIndex
+        if nodeIndex is None:
+            return [self.findNode(data) for data in dataItems]
+        nodes = []
+        for data in dataItems:
+            try:
+                node = nodeIndex.get(data)
+            except TypeError:
+                # Unhashable data, which findNode looks for in the list instead
+                node = None
+            if node is None:
+                node = self.findNode(data)
+            nodes.append(node)
+        return nodes
+
 
     def getNeighbors(self, node):
         """
@@ -157,6 +367,31 @@ class Graph:
             raise NodeIndexOutOfRangeException(0, self.numVerts, node)
 
 
+    def iterNeighbors(self, node):
+        """
+        Takes in a node index, and returns an iterator over the node's (neighbor, weight) tuples.
+        Unlike getNeighbors this does not copy the adjacency list, so it is the one to use in
+        loops that only read the neighbors. The graph must not be changed while iterating.
+        :param node: Node number to look up
+        :return: An iterator of tuples, each tuple contains node index and edge weight
+        """
+        if node < self.numVerts:
+            return iter(self.adjList[node])
+        else:
+            raise NodeIndexOutOfRangeException(0, self.numVerts, node)
+
+    def getDegree(self, node):
+        """
+        Takes in a node index, and returns how many edges touch it, without copying anything.
+        :param node: Node number to look up
+        :return: The number of entries in the node's adjacency list
+        """
+        if node < self.numVerts:
+            return len(self.adjList[node])
+        else:
+            raise NodeIndexOutOfRangeException(0, self.numVerts, node)
+
+
     def areNeighbors(self, node1, node2):
         """
         Takes in two node indices, and returns True if they are neighbors and False if they are not.
@@ -165,6 +400,8 @@ class Graph:
         :return: Returns True/False depending on whether there is an edge between the nodes
         """
         if node1 < self.numVerts and node2 < self.numVerts:
+            if self.edgeIndex is not None:
+                return node2 in self.edgeIndex[node1]
             for (n, w) in self.adjList[node1]:
                 if n == node2:
                     return True
@@ -183,6 +420,8 @@ class Graph:
         :return: The weight between them, if there is an edge, or None otherwise
         """
         if node1 < self.numVerts and node2 < self.numVerts:
+            if self.edgeIndex is not None:
+                return self.edgeIndex[node1].get(node2)
             for (n, w) in self.adjList[node1]:
                 if n == node2:
                     return w
@@ -192,7 +431,610 @@ class Graph:
         else:
             raise NodeIndexOutOfRangeException(0, self.numVerts, node2)
 
-    
+
+    def memoryUsage(self):
+        """
+        Adds up the bytes taken by the Python objects that make up the graph. Vertex bytes are
+        the adjacency list objects, node data and the two indexes' per-node parts; edge bytes
+        are the (neighbor, weight) tuples, their list slots, the weights (counted once per
+        edge, since both tuples share one weight object) and edge index entries. Neighbor
+        numbers are counted as shared with the rest of the program.
+        :return: A dictionary with the total, vertex and edge bytes, and bytes per vertex and per edge
+        """
+        getsize = sys.getsizeof
+        pointer = struct.calcsize('P')
+        emptyList = getsize([])
+        vertexBytes = getsize(self.adjList) + getsize(self.nodeData)
+        vertexBytes += sum(getsize(data) for data in self.nodeData)
+        if self.nodeIndex is not None:
+            vertexBytes += getsize(self.nodeIndex)
+        edgeBytes = 0
+        for lst in self.adjList:
+            vertexBytes += emptyList
+            edgeBytes += getsize(lst) - emptyList
+            for edge in lst:
+                edgeBytes += getsize(edge) + getsize(edge[1]) / 2
+        if self.edgeIndex is not None:
+            emptyDict = getsize({})
+            for index in self.edgeIndex:
+                vertexBytes += emptyDict
+                edgeBytes += getsize(index) - emptyDict
+            vertexBytes += len(self.edgeIndex) * pointer
+        return memoryReport(vertexBytes, edgeBytes, self.numVerts, self.numEdges)
+
+
+    # ---------------------------------------------------------
+    # Finally, conversion to other representations
+
+    def freeze(self):
+        """
+        Builds a read-only compressed sparse row (CSR) copy of the graph. The copy keeps the
+        neighbors of each node in the same order as the adjacency list, so algorithms give the
+        same answers on both, but stores every edge in flat typed arrays instead of tuples.
+        Later changes to this graph do not affect the copy.
+        :return: A new CSRGraph with the same nodes, node data and edges
+        """
+        n = self.numVerts
+        offsets = array('q', [0]) * (n + 1)
+        total = 0
+        for i in range(n):
+            total += len(self.adjList[i])
+            offsets[i + 1] = total
+        targets = array(indexTypecode(n), [t for lst in self.adjList for (t, w) in lst])
+        weights = weightArray([w for lst in self.adjList for (t, w) in lst])
+        return CSRGraph(n, offsets, targets, weights, self.nodeData, self.numEdges)
+
+    def save(self, path):
+        """
+        Writes the graph to a binary graph file that CSRGraph.load can open with mmap. The
+        file holds the frozen CSR form, so loading it gives back a read-only CSRGraph.
+        :param path: Name of the file to write
+        :return:
+        """
+        self.freeze().save(path)
+
+
+# ======================================================================
+
+class CSRGraph:
+    """A read-only weighted graph stored in compressed sparse row form. The neighbors of node i
+    are targets[offsets[i]] up to targets[offsets[i+1] - 1], and the weight of each of those edges
+    sits at the same position in weights. All three are flat typed arrays from the array module,
+    so an edge costs a few bytes rather than a tuple plus a list slot, and the neighbors of a node
+    sit next to each other in memory."""
+
+    __slots__ = ('numVerts', 'numEdges', 'nodeData', 'nodeIndex', 'offsets', 'targets',
+                 'weights', 'mmapFile')
+
+    def __init__(self, n, offsets, targets, weights, nodeData=None, numEdges=None):
+        """
+        Takes in the number of vertices and the three CSR arrays. Usually built by Graph.freeze
+        or CSRGraph.fromEdgeArrays rather than called directly.
+        :param n: The number of vertices in the graph
+        :param offsets: Array of n+1 positions into targets, where each node's neighbors start
+        :param targets: Array holding the neighbor node number of every directed edge entry
+        :param weights: Array holding the weight of every directed edge entry
+        :param nodeData: An optional list of labels/data to attach to each vertex
+        :param numEdges: The number of undirected edges, by default half the length of targets
+        """
+        self.numVerts = n
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        if nodeData is None:
+            self.nodeData = list(range(n))
+        else:
+            self.nodeData = list(nodeData)
+        self.nodeIndex = buildNodeIndex(self.nodeData)
+        self.mmapFile = None
+        if numEdges is None:
+            self.numEdges = len(targets) // 2
+        else:
+            self.numEdges = numEdges
+
+
+    @classmethod
+    def fromEdgeArrays(cls, n, sources, dests, weights, nodeData=None):
+        """
+        Builds a CSR graph straight from parallel sequences of edge endpoints and weights, without
+        going through an adjacency-list Graph first. Each entry (sources[k], dests[k], weights[k])
+        becomes one undirected edge, and neighbors end up in the same order addEdge would give.
+        :param n: The number of vertices in the graph
+        :param sources: Node numbers for the first node of each edge
+        :param dests: Node numbers for the second node of each edge
+        :param weights: The weight of each edge
+        :param nodeData: An optional list of labels/data to attach to each vertex
+        :return: A new CSRGraph
+        """
+        m = len(sources)
+        offsets = array('q', [0]) * (n + 1)
+        for k in range(m):
+            u = sources[k]
+            v = dests[k]
+            if u >= n:
+                raise NodeIndexOutOfRangeException(0, n, u)
+            if v >= n:
+                raise NodeIndexOutOfRangeException(0, n, v)
+            offsets[u + 1] += 1
+            offsets[v + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        # Fill each node's slice in edge order, using a moving cursor per node
+        cursor = array('q', offsets)
+        targets = array(indexTypecode(n), [0]) * (2 * m)
+        edgeWeights = weightArray(weights)
+        csrWeights = array(edgeWeights.typecode, [0]) * (2 * m)
+        for k in range(m):
+            u = sources[k]
+            v = dests[k]
+            w = edgeWeights[k]
+            targets[cursor[u]] = v
+            csrWeights[cursor[u]] = w
+            cursor[u] += 1
+            targets[cursor[v]] = u
+            csrWeights[cursor[v]] = w
+            cursor[v] += 1
+        return cls(n, offsets, targets, csrWeights, nodeData, m)
+
+
+    # ---------------------------------------------------------
+    # Saving and loading the binary graph file format. A file holds a fixed-size header, then
+    # the offsets, targets and weights arrays exactly as they sit in memory, each starting on an
+    # 8-byte boundary, and finally the pickled node data list. Because the arrays are stored
+    # raw, load can map the file and read them in place instead of parsing anything.
+
+    def save(self, path):
+        """
+        Writes the graph to a binary graph file.
+        :param path: Name of the file to write
+        :return:
+        """
+        offsets = array('q', self.offsets)
+        targets = array(self.targets.typecode if isinstance(self.targets, array)
+                        else self.targets.format, self.targets)
+        weights = array(self.weights.typecode if isinstance(self.weights, array)
+                        else self.weights.format, self.weights)
+        nodeBytes = pickle.dumps(self.nodeData, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(path, 'wb') as graphFile:
+            graphFile.write(FILE_HEADER.pack(FILE_MAGIC, sys.byteorder == 'little',
+                                             targets.typecode.encode(), weights.typecode.encode(),
+                                             self.numVerts, self.numEdges, len(targets),
+                                             len(nodeBytes)))
+            for section in (offsets, targets, weights):
+                section.tofile(graphFile)
+                graphFile.write(bytes(padTo8(section.itemsize * len(section))))
+            graphFile.write(nodeBytes)
+
+    @classmethod
+    def load(cls, path, useMmap=True):
+        """
+        Opens a binary graph file written by save. With useMmap the file is memory mapped and
+        the CSR arrays are memoryviews straight into the mapping, so opening takes the same time
+        for any size of graph, nothing is read until it is used, and processes that load the same
+        file share its pages through the page cache. Otherwise the arrays are read into memory.
+        Node data is unpickled, so only load files from a trusted source.
+        :param path: Name of the file to read
+        :param useMmap: If True (the default) map the file instead of reading it
+        :return: A new CSRGraph
+        """
+        with open(path, 'rb') as graphFile:
+            if useMmap:
+                # mmap refuses to map an empty file, so catch that here as a short file
+                if os.fstat(graphFile.fileno()).st_size < FILE_HEADER.size:
+                    raise GraphFileException(path, "file is too short to be a graph file")
+                data = mmap.mmap(graphFile.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = graphFile.read()
+        if len(data) < FILE_HEADER.size:
+            raise GraphFileException(path, "file is too short to be a graph file")
+        (magic, little, targetCode, weightCode, n, numEdges, entries,
+         nodeBytes) = FILE_HEADER.unpack_from(data, 0)
+        if magic != FILE_MAGIC:
+            raise GraphFileException(path, "not a graph file")
+        if bool(little) != (sys.byteorder == 'little'):
+            raise GraphFileException(path, "written on a machine with the other byte order")
+        targetCode = targetCode.decode()
+        weightCode = weightCode.decode()
+
+        view = memoryview(data)
+        pos = FILE_HEADER.size
+        sections = []
+        for (typecode, length) in (('q', n + 1), (targetCode, entries), (weightCode, entries)):
+            size = array(typecode).itemsize * length
+            if pos + size > len(data):
+                raise GraphFileException(path, "file is truncated")
+            section = view[pos:pos + size].cast(typecode)
+            if not useMmap:
+                section = array(typecode, section)
+            sections.append(section)
+            pos += size + padTo8(size)
+        if pos + nodeBytes > len(data):
+            raise GraphFileException(path, "file is truncated")
+        try:
+            nodeData = pickle.loads(view[pos:pos + nodeBytes])
+        except Exception as err:
+            raise GraphFileException(path, "node data cannot be read: " + str(err))
+
+        graph = cls(n, sections[0], sections[1], sections[2], nodeData, numEdges)
+        if useMmap:
+            graph.mmapFile = data
+        return graph
+
+    def memoryUsage(self):
+        """
+        Adds up the bytes the graph takes, the same way Graph.memoryUsage does. Vertex bytes are
+        the offsets array, node data and node index, and edge bytes are the targets and weights
+        arrays. For a memory-mapped graph the array bytes live in the page cache, shared with
+        every other process that has the file open, rather than in this process's own memory.
+        :return: A dictionary with the total, vertex and edge bytes, and bytes per vertex and per edge
+        """
+        getsize = sys.getsizeof
+        vertexBytes = bufferBytes(self.offsets) + getsize(self.nodeData)
+        vertexBytes += sum(getsize(data) for data in self.nodeData)
+        if self.nodeIndex is not None:
+            vertexBytes += getsize(self.nodeIndex)
+        edgeBytes = bufferBytes(self.targets) + bufferBytes(self.weights)
+        return memoryReport(vertexBytes, edgeBytes, self.numVerts, self.numEdges)
+
+    def close(self):
+        """
+        Releases the memory map behind a graph opened with load. The graph cannot be used after
+        this. Does nothing for graphs that are not memory mapped.
+        :return:
+        """
+        mapping = self.mmapFile
+        if mapping is None:
+            return
+        for section in (self.offsets, self.targets, self.weights):
+            section.release()
+        self.mmapFile = None
+        mapping.close()
+
+
+    # ---------------------------------------------------------
+    # Accessors, matching the ones on Graph
+
+    def getSize(self):
+        """
+        Returns the number of nodes in the graph
+        """
+        return self.numVerts
+
+    def getVertices(self):
+        """
+        Returns a range containing the node numbers for the graph
+        """
+        return range(self.numVerts)
+
+    def getEdges(self):
+        """
+        Returns the number of edges in the graph
+        """
+        return self.numEdges
+
+    def getVersion(self):
+        """
+        Returns the version number of the graph. A CSRGraph never changes, so this is always 0
+        """
+        return 0
+
+    def getData(self, node):
+        """
+        Takes in a node number, and returns the data associated with
+        the node, if any. If nothing else, it returns the node number.
+        :param node: Node number to look up
+        :return:
+        """
+        if node < self.numVerts:
+            return self.nodeData[node]
+        else:
+            raise NodeIndexOutOfRangeException(0, self.numVerts, node)
+
+    def findNode(self, data):
+        """
+        Takes in a data item, and returns the node index that contains the data item, if it exists.
+        Otherwise it raises an exception
+        :param data: The data item to look for
+        :return:
+        """
+        if self.nodeIndex is not None:
+            try:
+                return self.nodeIndex[data]
+            except KeyError:
+                raise NoSuchNodeException(data)
+            except TypeError:
+                pass
+        if data in self.nodeData:
+            return self.nodeData.index(data)
+        else:
+            raise NoSuchNodeException(data)
+
+    def findNodes(self, dataItems):
+        """
+        Takes in many data items at once, and returns the node index for each of them, in order.
+        Raises an exception for the first data item that is not in the graph
+        :param dataItems: An iterable of data items to look for
+        :return: A new list of node indices
+        """
+        nodeIndex = self.nodeIndex
+        if nodeIndex is None:
+            return [self.findNode(data) for data in dataItems]
+        nodes = []
+        for data in dataItems:
+            try:
+                node = nodeIndex.get(data)
+            except TypeError:
+                # Unhashable data, which findNode looks for in the list instead
+                node = None
+            if node is None:
+                node = self.findNode(data)
+            nodes.append(node)
+        return nodes
+
+    def neighborRange(self, node):
+        """
+        Takes in a node index, and returns the start and end positions of its neighbors in the
+        targets and weights arrays. Looping over range(start, end) visits every edge of the node
+        without building any tuples.
+        :param node: Node number to look up
+        :return: A (start, end) pair of positions
+        """
+        if node < self.numVerts:
+            return self.offsets[node], self.offsets[node + 1]
+        else:
+            raise NodeIndexOutOfRangeException(0, self.numVerts, node)
+
+    def getNeighbors(self, node):
+        """
+        Takes in a node index, and returns a new list of (neighbor, weight) tuples, the same shape
+        that Graph.getNeighbors returns.
+        :param node: Node number to look up
+        :return: A new list of tuples, each tuple contains node index and edge weight
+        """
+        start, end = self.neighborRange(node)
+        return list(zip(self.targets[start:end], self.weights[start:end]))
+
+    def iterNeighbors(self, node):
+        """
+        Takes in a node index, and returns an iterator over the node's (neighbor, weight) tuples
+        that reads the CSR arrays in place instead of slicing them.
+        :param node: Node number to look up
+        :return: An iterator of tuples, each tuple contains node index and edge weight
+        """
+        start, end = self.neighborRange(node)
+        targets = self.targets
+        weights = self.weights
+        return ((targets[i], weights[i]) for i in range(start, end))
+
+    def getDegree(self, node):
+        """
+        Takes in a node index, and returns how many edges touch it.
+        :param node: Node number to look up
+        :return: The number of entries in the node's slice of the targets array
+        """
+        start, end = self.neighborRange(node)
+        return end - start
+
+    def areNeighbors(self, node1, node2):
+        """
+        Takes in two node indices, and returns True if they are neighbors and False if they are not.
+        :param node1: First node to check
+        :param node2: Second node to check
+        :return: Returns True/False depending on whether there is an edge between the nodes
+        """
+        return self.getWeight(node1, node2) is not None
+
+    def getWeight(self, node1, node2):
+        """
+        Takes in two node indices, and returns the weight between them, or None if they are not neighbors.
+        :param node1: First node of the edge
+        :param node2: Second node of the edge
+        :return: The weight between them, if there is an edge, or None otherwise
+        """
+        if node2 >= self.numVerts:
+            raise NodeIndexOutOfRangeException(0, self.numVerts, node2)
+        start, end = self.neighborRange(node1)
+        targets = self.targets
+        for i in range(start, end):
+            if targets[i] == node2:
+                return self.weights[i]
+        return None
+
+
+def readEdgeList(path, resolve=None, delimiter=None, weightType=float, chunkSize=65536,
+                 skipHeader=False):
+    """
+    Streams an edge-list file as chunks of parallel (sources, dests, weights) lists, reading at
+    most chunkSize edges at a time. Used by Graph.loadEdgeList, and the chunks can just as well
+    be collected into arrays for CSRGraph.fromEdgeArrays. A line with only one field raises a
+    ValueError naming the line; chunks yielded before it have already been handed out.
+    :param path: Name of the edge-list file
+    :param resolve: Function turning a list of end labels into node numbers (such as
+    Graph.findNodes), or None if the file already holds node numbers
+    :param delimiter: Column separator, by default a tab for .tsv files and a comma otherwise
+    :param weightType: Function that turns the weight column text into a weight
+    :param chunkSize: The most edges in one chunk
+    :param skipHeader: If True, the first line of the file is ignored
+    :return: A generator of (sources, dests, weights) tuples of lists
+    """
+    if delimiter is None:
+        if str(path).endswith('.tsv'):
+            delimiter = '\t'
+        else:
+            delimiter = ','
+    with open(path, newline='') as edgeFile:
+        reader = csv.reader(edgeFile, delimiter=delimiter)
+        if skipHeader:
+            next(reader, None)
+        sources = []
+        dests = []
+        weights = []
+        for row in reader:
+            if not row or row[0].startswith('#'):
+                continue
+            if len(row) < 2:
+                raise ValueError("Line " + str(reader.line_num) + " of " + str(path)
+                                 + " has only one field, but an edge needs two ends")
+            sources.append(row[0].strip())
+            dests.append(row[1].strip())
+            if len(row) > 2:
+                weights.append(weightType(row[2]))
+            else:
+                weights.append(weightType('1'))
+            if len(sources) == chunkSize:
+                yield finishEdgeChunk(sources, dests, weights, resolve)
+                sources = []
+                dests = []
+                weights = []
+        if sources:
+            yield finishEdgeChunk(sources, dests, weights, resolve)
+
+
+def finishEdgeChunk(sources, dests, weights, resolve):
+    """
+    Turns the end columns of one chunk of an edge-list file into node numbers
+    :param sources: Text of the first end of each edge
+    :param dests: Text of the second end of each edge
+    :param weights: The weight of each edge
+    :param resolve: Function turning a list of labels into node numbers, or None for plain numbers
+    :return: A (sources, dests, weights) tuple of lists
+    """
+    if resolve is None:
+        return [int(x) for x in sources], [int(x) for x in dests], weights
+    return resolve(sources), resolve(dests), weights
+
+
+FILE_MAGIC = b'CSRGRAPH'
+# magic, little-endian flag, targets typecode, weights typecode, node count, edge count,
+# targets/weights length, pickled node data length
+FILE_HEADER = struct.Struct('=8s?cc5xQQQQ')
+
+
+def bufferBytes(buffer):
+    """
+    Returns the bytes held by the data of an array or memoryview
+    :param buffer: An array.array or memoryview
+    :return: Size of its data in bytes
+    """
+    return memoryview(buffer).nbytes
+
+
+def memoryReport(vertexBytes, edgeBytes, n, m):
+    """
+    Builds the dictionary returned by the memoryUsage methods
+    :param vertexBytes: Bytes charged to the vertices
+    :param edgeBytes: Bytes charged to the edges
+    :param n: The number of vertices
+    :param m: The number of edges
+    :return: A dictionary of byte counts
+    """
+    return {'total': int(vertexBytes + edgeBytes),
+            'vertexBytes': int(vertexBytes),
+            'edgeBytes': int(edgeBytes),
+            'perVertex': vertexBytes / n if n else 0.0,
+            'perEdge': edgeBytes / m if m else 0.0}
+
+
+def estimateGraphMemory(n, m, indexEdges=False, floatWeights=True):
+    """
+    Predicts how many bytes a graph with n vertices and m edges will take, before building it,
+    both as an adjacency-list Graph and as a CSRGraph. Node data is left out, since it depends
+    on the labels. The Graph figure assumes the degrees spread like those of a random graph
+    (Poisson around the average degree), with the slack CPython leaves when each list and
+    edge index dictionary is built by appending, and that every weight is its own object.
+    Graphs whose degrees are much more uneven, such as scale-free ones, can differ more, and
+    parallel edges share one index entry, so graphs with many of them take less than estimated.
+    :param n: The number of vertices
+    :param m: The number of edges
+    :param indexEdges: If True include the Graph's edge index
+    :param floatWeights: True for float weights, False for int weights
+    :return: A dictionary holding the estimated 'graph' and 'csr' bytes
+    """
+    getsize = sys.getsizeof
+    pointer = struct.calcsize('P')
+    if floatWeights:
+        weight = 0.5
+    else:
+        weight = 2 ** 20
+    # Lists and dictionaries grow in steps, so the cost of a vertex depends on its exact degree.
+    # Degrees are taken to spread like a random graph's, a Poisson distribution around the
+    # average, and the container sizes are averaged over that distribution
+    mean = 2 * m / n if n else 0
+    maxDegree = int(mean + 10 * math.sqrt(mean) + 10)
+    lst = []
+    index = {}
+    perVertex = pointer
+    if indexEdges:
+        perVertex += pointer
+    for k in range(maxDegree + 1):
+        # Worked out in logs, since exp(-mean) alone underflows for dense graphs
+        if mean > 0:
+            chance = math.exp(k * math.log(mean) - mean - math.lgamma(k + 1))
+        else:
+            chance = 1.0 if k == 0 else 0.0
+        perVertex += chance * getsize(lst)
+        if indexEdges:
+            perVertex += chance * getsize(index)
+        lst.append(None)
+        index[k] = None
+    perEdge = 2 * getsize((0, weight)) + getsize(weight)
+    graphBytes = getsize([]) + n * perVertex + m * perEdge
+
+    targetSize = array(indexTypecode(n)).itemsize
+    csrBytes = 8 * (n + 1) + 2 * m * (targetSize + 8)
+    return {'graph': int(graphBytes), 'csr': int(csrBytes)}
+
+
+def padTo8(size):
+    """
+    Returns how many zero bytes follow a section of the given size in a graph file
+    :param size: Size of the section in bytes
+    :return: Number of padding bytes, 0 through 7
+    """
+    return -size % 8
+
+
+def buildNodeIndex(nodeData):
+    """
+    Builds a dictionary from each node data item to the first node number holding it, the same
+    node that nodeData.index would find
+    :param nodeData: The list of node data
+    :return: The new dictionary, or None if some node data cannot be hashed
+    """
+    nodeIndex = {}
+    try:
+        for i in range(len(nodeData) - 1, -1, -1):
+            nodeIndex[nodeData[i]] = i
+    except TypeError:
+        return None
+    return nodeIndex
+
+
+def indexTypecode(n):
+    """
+    Picks the smallest array typecode that can hold node numbers below n
+    :param n: The number of vertices
+    :return: An array module typecode
+    """
+    if n < 2 ** 31:
+        return 'i'
+    return 'q'
+
+
+def weightArray(weights):
+    """
+    Packs edge weights into a typed array, as 64-bit integers if they are all integers and
+    as doubles otherwise
+    :param weights: A sequence of edge weights
+    :return: A new array holding the weights
+    """
+    try:
+        return array('q', weights)
+    except (TypeError, OverflowError):
+        return array('d', weights)
+
+
 # ======================================================================
 class NodeIndexOutOfRangeException(Exception):
     """A special exception for catching when a node reference is invalid"""
@@ -218,6 +1060,18 @@ class GraphFullException(Exception):
         return s
 
 
+class GraphFileException(Exception):
+    """A special exception for catching when a binary graph file cannot be loaded"""
+
+    def __init__(self, path, reason):
+        self.path = path
+        self.reason = reason
+
+    def __str__(self):
+        s = "Cannot load graph file " + str(self.path) + ": " + self.reason
+        return s
+
+
 class NoSuchNodeException(Exception):
     """A special exception for catching when node data is input that
     doesn't match any node data in the graph"""
@@ -25,6 +25,7 @@ print("Size:", g1.getSize())
 print("GetData:", g1.getData(4))
 print("Index for B:", g1.findNode('B'))
 print("Vertices:", g1.getVertices())
+print("Degree of B:", g1.getDegree(1))
 
 g1.removeEdge(1, 4)
 print("Are B and E neighbors?", g1.areNeighbors(1, 4))
@@ -0,0 +1,274 @@
+""" File:  GraphSnapshot.py
+Contains an immutable snapshot of a Graph, with its minimum spanning forest worked out
+ahead of time, for many threads or asyncio tasks to query at once, and a publisher that
+lets writers change the graph and hand out new snapshots without ever blocking readers
+"""
+
+import threading
+
+from Graph import Graph, NodeIndexOutOfRangeException
+from Kruskal import KruskalMST
+
+
+class GraphSnapshot:
+    """A read-only copy of a graph together with its minimum spanning forest. Everything is
+    built in the constructor and never changed afterwards: the edges live in a CSRGraph, and
+    the forest in tuples. So any number of threads can query one snapshot at the same time
+    without locks, and a snapshot a reader holds stays the same however the graph changes."""
+
+    __slots__ = ('graph', 'version', 'parent', 'parentWeight', 'depth', 'totalWeight')
+
+    def __init__(self, G, version=0):
+        """
+        Copies the graph and builds its minimum spanning forest. Each tree hangs from the
+        lowest numbered vertex of its component
+        :param G: A Graph, which is frozen into a CSR copy, or a CSRGraph, which is used as is
+        :param version: The version of the graph the snapshot was taken from
+        """
+        if isinstance(G, Graph):
+            G = G.freeze()
+        self.graph = G
+        self.version = version
+        n = G.getSize()
+        parent = KruskalMST(G, G.getData(0)) if n > 0 else []
+
+        # A tree edge may have parallel edges beside it, and the forest uses the lightest
+        parentWeight = [None] * n
+        for v in range(n):
+            u = parent[v]
+            if u is not None:
+                for (x, weight) in G.iterNeighbors(v):
+                    if x == u and (parentWeight[v] is None or weight < parentWeight[v]):
+                        parentWeight[v] = weight
+
+        # Vertices do not come in tree order, so each one walks up to the nearest vertex whose
+        # depth is known and fills in the depths on the way back down
+        depth = [-1] * n
+        for v in range(n):
+            path = []
+            x = v
+            while depth[x] == -1 and parent[x] is not None:
+                path.append(x)
+                x = parent[x]
+            if depth[x] == -1:
+                depth[x] = 0
+            d = depth[x]
+            for x in reversed(path):
+                d += 1
+                depth[x] = d
+
+        self.parent = tuple(parent)
+        self.parentWeight = tuple(parentWeight)
+        self.depth = tuple(depth)
+        self.totalWeight = sum(weight for weight in parentWeight if weight is not None)
+
+
+    # ---------------------------------------------------------
+    # Graph queries, passed on to the frozen graph
+
+    def getSize(self):
+        """
+        Returns the number of nodes in the graph
+        """
+        return self.graph.getSize()
+
+    def getVertices(self):
+        """
+        Returns a range containing the node numbers for the graph
+        """
+        return self.graph.getVertices()
+
+    def getEdges(self):
+        """
+        Returns the number of edges in the graph
+        """
+        return self.graph.getEdges()
+
+    def getData(self, node):
+        """
+        Takes in a node number, and returns the data associated with the node
+        :param node: Node number to look up
+        :return:
+        """
+        return self.graph.getData(node)
+
+    def findNode(self, data):
+        """
+        Takes in a data item, and returns the node index that contains the data item, if it exists.
+        Otherwise it raises an exception
+        :param data: The data item to look for
+        :return:
+        """
+        return self.graph.findNode(data)
+
+    def getNeighbors(self, node):
+        """
+        Takes in a node index, and returns a new list of (neighbor, weight) tuples
+        :param node: Node number to look up
+        :return: A new list of tuples, each tuple contains node index and edge weight
+        """
+        return self.graph.getNeighbors(node)
+
+    def iterNeighbors(self, node):
+        """
+        Takes in a node index, and returns an iterator over the node's (neighbor, weight) tuples
+        :param node: Node number to look up
+        :return: An iterator of tuples, each tuple contains node index and edge weight
+        """
+        return self.graph.iterNeighbors(node)
+
+    def getDegree(self, node):
+        """
+        Takes in a node index, and returns how many edges touch it
+        :param node: Node number to look up
+        :return:
+        """
+        return self.graph.getDegree(node)
+
+    def areNeighbors(self, node1, node2):
+        """
+        Takes in two node indices, and returns True if they are neighbors and False if they are not
+        :param node1: First node to check
+        :param node2: Second node to check
+        :return:
+        """
+        return self.graph.areNeighbors(node1, node2)
+
+    def getWeight(self, node1, node2):
+        """
+        Takes in two node indices, and returns the weight between them, or None if they are not neighbors
+        :param node1: First node of the edge
+        :param node2: Second node of the edge
+        :return:
+        """
+        return self.graph.getWeight(node1, node2)
+
+
+    # ---------------------------------------------------------
+    # Spanning forest queries
+
+    def getMST(self, A):
+        """
+        Returns a minimum spanning forest rooted at A, as a new predecessor list: the tree
+        holding A hangs from A, and every other tree from its lowest numbered vertex. Where
+        weights tie, the forest (built by Kruskal's algorithm) may differ from PrimMST's
+        :param A: Node data of the starting vertex
+        :return: A list holding the predecessor of each vertex in the tree, None for the roots
+        """
+        MST = list(self.parent)
+        prev = None
+        v = self.graph.findNode(A)
+        while v is not None:
+            nextVert = MST[v]
+            MST[v] = prev
+            prev = v
+            v = nextVert
+        return MST
+
+    def getTotalWeight(self):
+        """
+        Returns the total weight of the edges in the forest
+        """
+        return self.totalWeight
+
+    def sameTree(self, node1, node2):
+        """
+        Takes in two node indices, and returns True if they are in the same tree of the forest,
+        which is the same as being connected in the graph
+        :param node1: First node to check
+        :param node2: Second node to check
+        :return:
+        """
+        return self.treePath(node1, node2) is not None
+
+    def treePath(self, node1, node2):
+        """
+        Takes in two node indices, and returns the path between them in the spanning forest.
+        Both ends climb toward the root, the deeper one first, until they meet
+        :param node1: Node number to start from
+        :param node2: Node number to end at
+        :return: A list of node numbers from node1 to node2, or None if they are in different trees
+        """
+        parent = self.parent
+        depth = self.depth
+        n = len(parent)
+        for node in (node1, node2):
+            if not 0 <= node < n:
+                raise NodeIndexOutOfRangeException(0, n, node)
+        path1 = [node1]
+        path2 = [node2]
+        while node1 != node2:
+            if depth[node1] >= depth[node2]:
+                node1 = parent[node1]
+                if node1 is None:
+                    return None
+                path1.append(node1)
+            else:
+                node2 = parent[node2]
+                path2.append(node2)
+        path2.pop()
+        path2.reverse()
+        return path1 + path2
+
+    def treePathWeight(self, node1, node2):
+        """
+        Takes in two node indices, and returns the total weight of the forest path between them
+        :param node1: Node number at one end
+        :param node2: Node number at the other end
+        :return: The sum of the edge weights on the path, or None if they are in different trees
+        """
+        path = self.treePath(node1, node2)
+        if path is None:
+            return None
+        total = 0
+        for (u, v) in zip(path, path[1:]):
+            if self.parent[u] == v:
+                total += self.parentWeight[u]
+            else:
+                total += self.parentWeight[v]
+        return total
+
+
+# ======================================================================
+
+class SnapshotPublisher:
+    """Hands out GraphSnapshots of a graph that writers keep changing. Writers change the
+    publisher's own Graph under a lock and then publish a fresh snapshot, which is copied from
+    the graph. Readers just take the current snapshot: replacing it is a single assignment, so
+    they never wait on a writer, and a snapshot they already hold is never changed.
+    Publishing is not incremental: every snapshot freezes the whole graph and reruns
+    Kruskal's algorithm, which is O(E log E). Writers making many changes should pass them
+    to one update call, so they are published together as a single snapshot."""
+
+    __slots__ = ('graph', 'lock', 'current')
+
+    def __init__(self, G):
+        """
+        Takes over a graph and publishes its first snapshot
+        :param G: A Graph, which from now on should only be changed through update
+        """
+        self.graph = G
+        self.lock = threading.Lock()
+        self.current = GraphSnapshot(G, G.getVersion())
+
+    def snapshot(self):
+        """
+        Returns the latest published snapshot. Never blocks
+        """
+        return self.current
+
+    def update(self, *changes):
+        """
+        Calls each change(graph) in turn on the publisher's graph while holding the write lock,
+        then publishes one new snapshot for all of them, at a cost of O(E log E). If the changes
+        left the graph's version where it was, the current snapshot is kept. Writers wait for
+        each other, but not readers
+        :param changes: Functions that each take the Graph and change it
+        :return: The new snapshot
+        """
+        with self.lock:
+            for change in changes:
+                change(self.graph)
+            if self.graph.getVersion() != self.current.version:
+                self.current = GraphSnapshot(self.graph, self.graph.getVersion())
+            return self.current
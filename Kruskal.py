@@ -0,0 +1,121 @@
+""" File:  Kruskal.py
+Contains Kruskal's minimum spanning tree algorithm and the disjoint set (union-find)
+class it uses, over the graph classes in Graph.py
+"""
+
+from heapsort import heapSort
+
+
+class DisjointSet:
+    """A disjoint set forest over the items 0 through n-1, with union by rank and path
+    compression, so any sequence of operations takes close to constant time each"""
+
+    __slots__ = ('parent', 'rank', 'numSets')
+
+    def __init__(self, n):
+        """
+        Starts every item off in a set of its own
+        :param n: The number of items
+        """
+        self.parent = list(range(n))
+        self.rank = [0] * n
+        self.numSets = n
+
+    def find(self, item):
+        """
+        Returns the representative item of the set containing item, pointing every item on
+        the way straight at it
+        :param item: Item to look up
+        :return: The representative of the item's set
+        """
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            nextItem = parent[item]
+            parent[item] = root
+            item = nextItem
+        return root
+
+    def union(self, item1, item2):
+        """
+        Merges the sets holding the two items, hanging the shallower tree under the deeper one
+        :param item1: Item in the first set
+        :param item2: Item in the second set
+        :return: True if the sets were merged, False if the items were already in the same set
+        """
+        root1 = self.find(item1)
+        root2 = self.find(item2)
+        if root1 == root2:
+            return False
+        if self.rank[root1] < self.rank[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        if self.rank[root1] == self.rank[root2]:
+            self.rank[root1] += 1
+        self.numSets -= 1
+        return True
+
+
+def KruskalMST(G, A, useHeapSort=False):
+    """
+    Takes in a graph G and a starting vertex A, sorts all the edges by weight and adds each one
+    that joins two different trees, until everything reachable is joined. On a disconnected graph
+    this gives a spanning tree for every component. The result is a list of predecessor vertices
+    to its index, the same shape PrimMST returns: the tree holding A hangs from A, and every
+    other tree hangs from its lowest numbered vertex.
+    :param G: A Graph or CSRGraph
+    :param A: Node data of the starting vertex
+    :param useHeapSort: If True sort the edges with heapsort.heapSort instead of the built-in sort
+    :return: A list holding the predecessor of each vertex in the tree, None for the roots
+    """
+    n = G.getSize()
+    start = G.findNode(A)
+    edges = []
+    for u in range(n):
+        for (v, weight) in G.iterNeighbors(u):
+            if u < v:
+                edges.append((weight, u, v))
+    if useHeapSort:
+        heapSort(edges)
+    else:
+        edges.sort()
+
+    sets = DisjointSet(n)
+    treeAdj = [[] for i in range(n)]
+    treeEdges = 0
+    for (weight, u, v) in edges:
+        if sets.union(u, v):
+            treeAdj[u].append(v)
+            treeAdj[v].append(u)
+            treeEdges += 1
+            if treeEdges == n - 1:
+                break
+    return orientForest(treeAdj, start)
+
+
+def orientForest(treeAdj, start):
+    """
+    Takes the adjacency lists of a forest and turns them into a predecessor list, hanging the
+    tree that holds start from start and every other tree from its lowest numbered vertex
+    :param treeAdj: List of neighbor lists, one per vertex, holding only tree edges
+    :param start: Vertex number to use as the root of its tree
+    :return: A list holding the predecessor of each vertex, None for the roots
+    """
+    n = len(treeAdj)
+    MST = [None] * n
+    seen = [False] * n
+    for root in [start] + list(range(n)):
+        if seen[root]:
+            continue
+        seen[root] = True
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            for v in treeAdj[u]:
+                if not seen[v]:
+                    seen[v] = True
+                    MST[v] = u
+                    stack.append(v)
+    return MST
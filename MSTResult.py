@@ -0,0 +1,278 @@
+""" File:  MSTResult.py
+Contains a compact, array-backed minimum spanning tree (or forest) result, holding the
+predecessor and edge weight of every vertex, and answering path queries between two
+vertices in O(log V) time with a binary lifting index
+"""
+
+from array import array
+
+from Graph import indexTypecode, weightArray, NodeIndexOutOfRangeException
+
+
+class MSTResult:
+    """A minimum spanning forest stored in flat typed arrays. parent[v] is the predecessor of
+    vertex v, or -1 at a root, and weight[v] is the weight of the edge from v to its parent
+    (0 at a root). Indexing, iterating, len and == behave like the predecessor list PrimMST
+    returns, with None at the roots. The first path query builds a binary lifting index,
+    which costs about log2(V) more arrays of each kind; after that pathMax, treeDistance and
+    lowestCommonAncestor each take O(log V) time."""
+
+    __slots__ = ('numVerts', 'parent', 'weight', 'totalWeight', 'numTreeEdges', 'order',
+                 'depth', 'root', 'dist', 'up', 'upMax')
+
+    def __init__(self, parent, weight, order):
+        """
+        Takes the forest as parallel sequences. Usually built by PrimMSTResult or
+        MSTResult.fromPredecessors rather than called directly.
+        :param parent: The predecessor of each vertex, None (or -1) for the roots
+        :param weight: The weight of the edge from each vertex to its predecessor
+        :param order: Every vertex once, each one after its predecessor, as Prim's algorithm
+        takes them out of the heap
+        """
+        n = len(parent)
+        self.numVerts = n
+        code = indexTypecode(n)
+        self.parent = array(code, [-1 if p is None else p for p in parent])
+        self.weight = weightArray([0 if self.parent[v] == -1 else weight[v] for v in range(n)])
+        self.order = array(code, order)
+        self.numTreeEdges = 0
+        self.totalWeight = 0
+        for v in range(n):
+            if self.parent[v] != -1:
+                self.numTreeEdges += 1
+                self.totalWeight += self.weight[v]
+
+        # Parents come before their children in order, so one pass fills in the depth, the
+        # root and the distance from the root of every vertex
+        self.depth = array(code, [0]) * n
+        self.root = array(code, [0]) * n
+        self.dist = array(self.weight.typecode, [0]) * n
+        for v in self.order:
+            p = self.parent[v]
+            if p == -1:
+                self.root[v] = v
+            else:
+                self.depth[v] = self.depth[p] + 1
+                self.root[v] = self.root[p]
+                self.dist[v] = self.dist[p] + self.weight[v]
+        self.up = None
+        self.upMax = None
+
+    @classmethod
+    def fromPredecessors(cls, G, MST):
+        """
+        Builds a result from a predecessor list for G, such as KruskalMST returns. Where there
+        are parallel edges the lightest one is taken as the tree edge.
+        :param G: A Graph or CSRGraph
+        :param MST: A list holding the predecessor of each vertex, None for the roots
+        :return: A new MSTResult
+        """
+        n = len(MST)
+        weight = [0] * n
+        children = [[] for i in range(n)]
+        order = []
+        for v in range(n):
+            u = MST[v]
+            if u is None:
+                order.append(v)
+            else:
+                children[u].append(v)
+                weight[v] = min(w for (x, w) in G.iterNeighbors(v) if x == u)
+        for v in order:
+            order.extend(children[v])
+        return cls(MST, weight, order)
+
+
+    # ---------------------------------------------------------
+    # Acting like a predecessor list
+
+    def __len__(self):
+        return self.numVerts
+
+    def __getitem__(self, node):
+        p = self.parent[node]
+        if p == -1:
+            return None
+        return p
+
+    def __iter__(self):
+        for p in self.parent:
+            if p == -1:
+                yield None
+            else:
+                yield p
+
+    def __eq__(self, other):
+        if isinstance(other, MSTResult):
+            return self.parent == other.parent
+        try:
+            return self.getPredecessors() == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return "MSTResult(" + str(self.getPredecessors()) + ")"
+
+    def getPredecessors(self):
+        """
+        Returns the forest as a new predecessor list, None for the roots
+        """
+        return list(self)
+
+
+    # ---------------------------------------------------------
+    # Whole-tree values
+
+    def getTotalWeight(self):
+        """
+        Returns the total weight of the edges in the forest
+        """
+        return self.totalWeight
+
+    def getWeight(self, node):
+        """
+        Takes in a node number, and returns the weight of the tree edge to its predecessor,
+        or None at a root
+        :param node: Node number to look up
+        :return:
+        """
+        self.checkNode(node)
+        if self.parent[node] == -1:
+            return None
+        return self.weight[node]
+
+    def getTreeEdges(self):
+        """
+        Returns the edges of the forest as a list of (node, predecessor, weight) tuples
+        """
+        edges = []
+        for v in range(self.numVerts):
+            p = self.parent[v]
+            if p != -1:
+                edges.append((v, p, self.weight[v]))
+        return edges
+
+    def sameTree(self, node1, node2):
+        """
+        Takes in two node numbers, and returns True if they are in the same tree of the forest
+        :param node1: First node to check
+        :param node2: Second node to check
+        :return:
+        """
+        self.checkNode(node1)
+        self.checkNode(node2)
+        return self.root[node1] == self.root[node2]
+
+
+    # ---------------------------------------------------------
+    # Path queries, using the binary lifting index
+
+    def buildIndex(self):
+        """
+        Builds the binary lifting index: up[k][v] is the vertex 2**k steps above v (or its
+        root, if the tree is not that deep), and upMax[k][v] is the heaviest edge on the way
+        there. Called by the first path query, so it only needs calling to pay the cost early.
+        :return:
+        """
+        if self.up is not None:
+            return
+        n = self.numVerts
+        code = self.parent.typecode
+        base = array(code, [v if self.parent[v] == -1 else self.parent[v] for v in range(n)])
+        up = [base]
+        upMax = [array(self.weight.typecode, self.weight)]
+        levels = max(1, max(self.depth, default=0).bit_length())
+        for k in range(1, levels):
+            half = up[k - 1]
+            halfMax = upMax[k - 1]
+            nextUp = array(code, [half[half[v]] for v in range(n)])
+            nextMax = array(halfMax.typecode, [max(halfMax[v], halfMax[half[v]]) for v in range(n)])
+            up.append(nextUp)
+            upMax.append(nextMax)
+        self.up = up
+        self.upMax = upMax
+
+    def lowestCommonAncestor(self, node1, node2):
+        """
+        Takes in two node numbers, and returns the deepest vertex that is an ancestor of both
+        :param node1: First node
+        :param node2: Second node
+        :return: The node number of the common ancestor, or None if they are in different trees
+        """
+        return self.climb(node1, node2)[0]
+
+    def pathMax(self, node1, node2):
+        """
+        Takes in two node numbers, and returns the weight of the heaviest edge on the tree path
+        between them, which is the bottleneck edge of the cheapest way to connect them
+        :param node1: Node number at one end
+        :param node2: Node number at the other end
+        :return: The largest edge weight on the path, or None if the path has no edges
+        """
+        return self.climb(node1, node2)[1]
+
+    def treeDistance(self, node1, node2):
+        """
+        Takes in two node numbers, and returns the total weight of the tree path between them
+        :param node1: Node number at one end
+        :param node2: Node number at the other end
+        :return: The sum of the edge weights on the path, or None if they are in different trees
+        """
+        ancestor = self.climb(node1, node2)[0]
+        if ancestor is None:
+            return None
+        return self.dist[node1] + self.dist[node2] - 2 * self.dist[ancestor]
+
+    def climb(self, node1, node2):
+        """
+        Lifts the two nodes up to their lowest common ancestor in O(log V) jumps, keeping track
+        of the heaviest edge passed on the way
+        :param node1: First node
+        :param node2: Second node
+        :return: A (common ancestor, heaviest edge) pair, (None, None) if the nodes are in
+        different trees, and a heaviest edge of None if the two nodes are the same
+        """
+        self.checkNode(node1)
+        self.checkNode(node2)
+        if self.root[node1] != self.root[node2]:
+            return None, None
+        self.buildIndex()
+        up = self.up
+        upMax = self.upMax
+        depth = self.depth
+        heaviest = None
+        if depth[node1] < depth[node2]:
+            node1, node2 = node2, node1
+        # First lift the deeper node to the same depth as the other
+        diff = depth[node1] - depth[node2]
+        k = 0
+        while diff:
+            if diff & 1:
+                if heaviest is None or upMax[k][node1] > heaviest:
+                    heaviest = upMax[k][node1]
+                node1 = up[k][node1]
+            diff >>= 1
+            k += 1
+        if node1 == node2:
+            return node1, heaviest
+        # Then lift both together, as far as they can go without meeting
+        for k in range(len(up) - 1, -1, -1):
+            if up[k][node1] != up[k][node2]:
+                for w in (upMax[k][node1], upMax[k][node2]):
+                    if heaviest is None or w > heaviest:
+                        heaviest = w
+                node1 = up[k][node1]
+                node2 = up[k][node2]
+        for w in (self.weight[node1], self.weight[node2]):
+            if heaviest is None or w > heaviest:
+                heaviest = w
+        return self.parent[node1], heaviest
+
+    def checkNode(self, node):
+        """
+        Raises an exception if node is not a node number of the forest
+        :param node: Node number to check
+        :return:
+        """
+        if not 0 <= node < self.numVerts:
+            raise NodeIndexOutOfRangeException(0, self.numVerts, node)
@@ -0,0 +1,253 @@
+"""
+A repeatable benchmark harness for heapSort, PrimMST and Graph construction.
+
+Every case is timed with time.perf_counter after some warmup runs, then reported as
+median, 95th percentile, min and mean over the repeats. Results can be written to JSON
+and compared against an earlier JSON file to catch performance regressions:
+
+    python benchmark.py --output base.json
+    python benchmark.py --compare base.json --tolerance 0.10
+
+The second command exits with status 1 if any case's median got slower by more than
+the tolerance.
+"""
+
+import argparse
+import importlib
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+
+from Graph import Graph
+from heapsort import heapSort
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The file name has an apostrophe in it, so it cannot be imported with a plain import statement
+PrimMST = importlib.import_module("Prims'Algorithm").PrimMST
+
+HEAPSORT_SIZES = [1000, 10000, 100000]
+GRAPH_SIZES = {'sparse': [1000, 10000, 100000],
+               'dense': [200, 500, 1000],
+               'grid': [1024, 10000, 99856],
+               'scalefree': [1000, 10000, 100000]}
+QUICK_HEAPSORT_SIZES = [1000, 5000]
+QUICK_GRAPH_SIZES = {'sparse': [1000, 5000],
+                     'dense': [100, 200],
+                     'grid': [1024, 4900],
+                     'scalefree': [1000, 5000]}
+
+
+# ----------------------------------------------------------------------
+# Timing
+
+def timeCase(run, setup, repeats, warmup):
+    """Calls setup() and then run() on its result, warmup times untimed and then repeats
+    times timed, so only run() is measured. Returns the summary of the timed runs."""
+    for i in range(warmup):
+        run(setup())
+    times = []
+    for i in range(repeats):
+        arg = setup()
+        t1 = time.perf_counter()
+        run(arg)
+        t2 = time.perf_counter()
+        times.append(t2 - t1)
+    return summarize(times)
+
+
+def summarize(times):
+    """Returns the median, 95th percentile (nearest rank), min and mean of a list of times"""
+    ordered = sorted(times)
+    p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    return {'median': statistics.median(ordered), 'p95': p95, 'min': ordered[0],
+            'mean': statistics.fmean(ordered), 'times': times}
+
+
+# ----------------------------------------------------------------------
+# Inputs
+
+def makeArray(kind, size, rng):
+    """Builds a heapSort input of the given kind: random floats, already sorted, reversed,
+    duplicate-heavy (only ten distinct values), or a NumPy array of random floats"""
+    if kind == 'random':
+        return [rng.random() for i in range(size)]
+    if kind == 'sorted':
+        return sorted(rng.random() for i in range(size))
+    if kind == 'reversed':
+        return sorted((rng.random() for i in range(size)), reverse=True)
+    if kind == 'duplicates':
+        return [rng.randrange(10) for i in range(size)]
+    if kind == 'ndarray':
+        return np.array([rng.random() for i in range(size)])
+    raise ValueError("Unknown array kind " + kind)
+
+
+def makeEdges(kind, n, rng):
+    """Builds the (u, v, weight) edge list of a random graph of the given kind, and returns
+    it with the number of vertices (which grids round down to a square)"""
+    edges = []
+    if kind == 'sparse':
+        # A random spanning tree plus about three more edges per vertex
+        for v in range(1, n):
+            edges.append((v, rng.randrange(v), rng.random()))
+        for i in range(3 * n):
+            edges.append((rng.randrange(n), rng.randrange(n), rng.random()))
+    elif kind == 'dense':
+        # Every pair of vertices is joined with probability one half
+        for u in range(n):
+            for v in range(u + 1, n):
+                if rng.random() < 0.5:
+                    edges.append((u, v, rng.random()))
+    elif kind == 'grid':
+        side = math.isqrt(n)
+        n = side * side
+        for r in range(side):
+            for c in range(side):
+                v = r * side + c
+                if c + 1 < side:
+                    edges.append((v, v + 1, rng.random()))
+                if r + 1 < side:
+                    edges.append((v, v + side, rng.random()))
+    elif kind == 'scalefree':
+        # Barabasi-Albert preferential attachment: each new vertex joins three existing ones,
+        # chosen with probability proportional to their degree
+        links = 3
+        ends = []
+        for v in range(1, min(links + 1, n)):
+            edges.append((v, 0, rng.random()))
+            ends.extend((v, 0))
+        for v in range(links + 1, n):
+            chosen = set()
+            while len(chosen) < links:
+                chosen.add(rng.choice(ends))
+            for u in chosen:
+                edges.append((v, u, rng.random()))
+                ends.extend((v, u))
+    else:
+        raise ValueError("Unknown graph kind " + kind)
+    return n, edges
+
+
+def buildGraph(n, edges):
+    """Builds a Graph from an edge list"""
+    graph = Graph(n)
+    graph.addEdges(edges)
+    return graph
+
+
+# ----------------------------------------------------------------------
+# Suites
+
+def heapsortSuite(sizes, seed, repeats, warmup):
+    """Times heapSort on every input kind and size"""
+    kinds = ['random', 'sorted', 'reversed', 'duplicates']
+    if np is not None:
+        kinds.append('ndarray')
+    results = []
+    for kind in kinds:
+        for size in sizes:
+            data = makeArray(kind, size, random.Random(seed))
+            stats = timeCase(heapSort, data.copy, repeats, warmup)
+            results.append(record('heapsort', kind, size, stats))
+    return results
+
+
+def graphSuites(sizes, seed, repeats, warmup, suites):
+    """Times Graph construction and PrimMST on every graph kind and size"""
+    results = []
+    for kind in sizes:
+        for size in sizes[kind]:
+            n, edges = makeEdges(kind, size, random.Random(seed))
+            if 'graph' in suites:
+                stats = timeCase(lambda e: buildGraph(n, e), lambda: edges, repeats, warmup)
+                results.append(record('graph', kind, n, stats, len(edges)))
+            if 'mst' in suites:
+                graph = buildGraph(n, edges)
+                stats = timeCase(lambda g: PrimMST(g, 0), lambda: graph, repeats, warmup)
+                results.append(record('mst', kind, n, stats, len(edges)))
+    return results
+
+
+def record(suite, case, size, stats, edges=None):
+    """Packs one result, and prints it as it comes in"""
+    result = {'suite': suite, 'case': case, 'size': size}
+    if edges is not None:
+        result['edges'] = edges
+    result.update(stats)
+    print("%-9s %-11s %8d   median %9.4fs   p95 %9.4fs" % (suite, case, size, stats['median'],
+                                                           stats['p95']))
+    return result
+
+
+# ----------------------------------------------------------------------
+# Comparing runs
+
+def compareResults(baseline, results, tolerance):
+    """Prints how each case's median changed against a baseline run, and returns the cases
+    that got slower by more than the tolerance (0.10 means 10%)"""
+    before = {}
+    for result in baseline['results']:
+        before[(result['suite'], result['case'], result['size'])] = result
+    regressions = []
+    for result in results:
+        old = before.get((result['suite'], result['case'], result['size']))
+        if old is None:
+            continue
+        ratio = result['median'] / old['median'] if old['median'] > 0 else float('inf')
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(result)
+        print("%-9s %-11s %8d   %9.4fs -> %9.4fs   x%.2f%s" % (result['suite'], result['case'],
+              result['size'], old['median'], result['median'], ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark heapSort, PrimMST and Graph construction")
+    parser.add_argument('--suite', choices=['heapsort', 'mst', 'graph'], action='append',
+                        help="Suite to run; may be given more than once (default: all)")
+    parser.add_argument('--quick', action='store_true', help="Use small sizes for a fast check")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=9159168)
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--compare', help="Compare against the results in this JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="Allowed slowdown of a median before it counts as a regression")
+    args = parser.parse_args(argv)
+
+    suites = args.suite or ['heapsort', 'mst', 'graph']
+    results = []
+    if 'heapsort' in suites:
+        sizes = QUICK_HEAPSORT_SIZES if args.quick else HEAPSORT_SIZES
+        results.extend(heapsortSuite(sizes, args.seed, args.repeats, args.warmup))
+    if 'mst' in suites or 'graph' in suites:
+        sizes = QUICK_GRAPH_SIZES if args.quick else GRAPH_SIZES
+        results.extend(graphSuites(sizes, args.seed, args.repeats, args.warmup, suites))
+
+    run = {'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'seed': args.seed, 'repeats': args.repeats, 'warmup': args.warmup,
+                    'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+           'results': results}
+    if args.output:
+        with open(args.output, 'w') as outFile:
+            json.dump(run, outFile, indent=1)
+    if args.compare:
+        with open(args.compare) as baseFile:
+            baseline = json.load(baseFile)
+        if compareResults(baseline, results, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
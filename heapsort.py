@@ -1,32 +1,62 @@
+import os
+import shutil
+import struct
+import tempfile
+import time
+from array import array as typedArray
+from array import typecodes
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; without it ndarrays cannot show up, and array.array input
+    # still takes the numeric path
+    np = None
+
+
 class Heap:
-    def __init__(self, Array):
+    # Slots instead of a per-instance dictionary keep every heap object small
+    __slots__ = ('arity', 'bottomUp', 'heapSize', 'heap')
+
+    def __init__(self, Array, arity=2, bottomUp=False):
         # Set up the heapSize and heap variables
+        # arity is how many children each node has (2, 4 and 8 are the useful ones), and
+        # bottomUp picks the bottom-up walkDown, which does fewer comparisons per level
         # Call the buildHeap to build a heap from the array
+        if arity < 2:
+            raise ValueError("Heap arity must be at least 2")
+        self.arity = arity
+        self.bottomUp = bottomUp
         self.heapSize = len(Array)
         self.heap = Array
         self.buildHeap(Array)
 
     def parentOf(self, Index):
         # Returns the index of the parent of the index node
-        return (Index - 1) // 2
+        return (Index - 1) // self.arity
 
     def leftChildOf(self, Index):
         # Returns the left child index of the index node
-        return (2 * Index + 1)
+        return (self.arity * Index + 1)
 
     def rightChildOf(self, Index):
-        # Returns the right child index of the index node
-        return (2 * Index + 2)
+        # Returns the index of the second child of the index node (the right one in a binary heap)
+        return (self.arity * Index + 2)
 
     def isEmpty(self):
         # Returns if the heap is empty
         return (self.heapSize == 0)
 
     def buildHeap(self, inputArray):
-        # Builds the heap from the half way of the array
-        for r in range(len(inputArray)//2, -1, -1):
+        # Builds the heap from the last node with children back up to the root
+        for r in range(self.parentOf(self.heapSize - 1), -1, -1):
             self.walkDown(r)
 
+    def capacity(self):
+        # Returns how many slots the storage has. Slots past heapSize are dead ones left behind
+        # by deleteLargest, which insert reuses before growing the storage
+        return len(self.heap)
+
     def lookUpLargest(self):
         # Returns the root of the heap. Or prints Empty Heap if there is no elements in it
         if self.heapSize == 0:
@@ -35,21 +65,51 @@ class Heap:
             return self.heap[0]
 
     def insert(self, val):
-        # Insert the value towards the end of the heap and checks the heap at the end
-        self.heap.insert(self.heapSize, val)
+        # Puts the value in the first free slot and checks the heap at the end. A dead slot left
+        # by deleteLargest is overwritten; only a full heap grows its storage, by appending, so
+        # inserting is O(log n) no matter how many deletes came before
+        if self.heapSize < len(self.heap):
+            self.heap[self.heapSize] = val
+        else:
+            self.heap.append(val)
         self.heapSize = self.heapSize + 1
         self.walkUp(self.heapSize-1)
 
+    def entryFor(self, val):
+        # Turns a value into what is stored in the heap. The plain Heap stores values as they
+        # are; subclasses that decorate or count what goes in override this
+        return val
+
+    def pushMany(self, values):
+        # Adds many values at once. A small batch is walked up value by value, but once the batch
+        # is at least as big as the heap it is cheaper to drop the values in and rebuild the whole
+        # heap, which is O(n) rather than O(k log n). Values dropped in still go through entryFor
+        values = list(values)
+        if len(values) < self.heapSize:
+            for val in values:
+                self.insert(val)
+            return
+        self.shrink()
+        self.heap.extend([self.entryFor(val) for val in values])
+        self.heapSize = self.heapSize + len(values)
+        self.buildHeap(self.heap)
+
+    def shrink(self):
+        # Gives back the dead slots past the end of the heap
+        del self.heap[self.heapSize:]
+
     def walkUp(self, startPos):
-        # Checks the corresponding heap of the input node
+        # Checks the corresponding heap of the input node. Smaller parents move down into the
+        # hole, and the value is written once at the end instead of being swapped every level
+        heap = self.heap
+        item = heap[startPos]
         currPos = startPos
         parentPos = self.parentOf(currPos)
-        while currPos > 0 and self.heap[currPos] > self.heap[parentPos]:
-            temp = self.heap[currPos]
-            self.heap[currPos] = self.heap[parentPos]
-            self.heap[parentPos] = temp
+        while currPos > 0 and item > heap[parentPos]:
+            heap[currPos] = heap[parentPos]
             currPos = parentPos
             parentPos = self.parentOf(currPos)
+        heap[currPos] = item
 
     def deleteLargest(self):
         # Takes away the root and checks the corresponding heap of the new root
@@ -57,55 +117,1112 @@ class Heap:
         self.heapSize = self.heapSize - 1
         self.walkDown(0)
 
+    def replaceLargest(self, val):
+        # Swaps the root for a new value and walks it down, returning the old root. This is one
+        # walk instead of the two that deleteLargest followed by insert would take
+        largest = self.heap[0]
+        self.heap[0] = val
+        self.walkDown(0)
+        return largest
+
     def walkDown(self, startPos):
-        # Finds the larger kid of the node at the startPos and determines whether to swap them or not
+        # Finds the larger kid of the node at the startPos and determines whether to move it up or not.
+        # Like walkUp, the value waits aside while larger kids move up into the hole
+        if self.bottomUp:
+            self.walkDownBottomUp(startPos)
+            return
+        heap = self.heap
+        item = heap[startPos]
         currPos = startPos
         bigChildPos = self.findLargerChild(currPos)
-        while 2 * currPos + 1 < self.heapSize and self.heap[currPos] < self.heap[bigChildPos]:
-            temp = self.heap[bigChildPos]
-            self.heap[bigChildPos] = self.heap[currPos]
-            self.heap[currPos] = temp
+        while bigChildPos != -1 and item < heap[bigChildPos]:
+            heap[currPos] = heap[bigChildPos]
             currPos = bigChildPos
             bigChildPos = self.findLargerChild(currPos)
+        heap[currPos] = item
+
+    def walkDownBottomUp(self, startPos):
+        # Bottom-up (Floyd/Wegener) walk down. The value at startPos usually belongs near the bottom,
+        # so first follow the larger kids all the way to a leaf without comparing against the value,
+        # which is one comparison per level in a binary heap instead of two. Then climb back up that
+        # path to the first node not smaller than the value, put the value there, and shift the
+        # nodes above it on the path up one level
+        heap = self.heap
+        item = heap[startPos]
+        leafPos = startPos
+        childPos = self.findLargerChild(leafPos)
+        while childPos != -1:
+            leafPos = childPos
+            childPos = self.findLargerChild(leafPos)
+
+        pos = leafPos
+        while pos != startPos and heap[pos] < item:
+            pos = self.parentOf(pos)
+        carry = heap[pos]
+        heap[pos] = item
+        while pos != startPos:
+            pos = self.parentOf(pos)
+            temp = heap[pos]
+            heap[pos] = carry
+            carry = temp
 
     def findLargerChild(self, pos):
-        # Compares the two children of the node at the pos index
+        # Compares the children of the node at the pos index, and returns the index of the
+        # largest one, or -1 if it has none
         lchildPos = self.leftChildOf(pos)
-        rchildPos = self.rightChildOf(pos)
 
         if lchildPos >= self.heapSize:
             return -1
 
-        elif rchildPos >= self.heapSize:
-            return lchildPos
+        heap = self.heap
+        bigChildPos = lchildPos
+        for childPos in range(lchildPos + 1, min(lchildPos + self.arity, self.heapSize)):
+            if heap[bigChildPos] < heap[childPos]:
+                bigChildPos = childPos
+        return bigChildPos
+
+
+class IndexedHeap(Heap):
+    # A min-heap over the items 0 through size-1, where each item sits in the heap at most once.
+    # The heap list holds item numbers, key holds the priority of each item and pos holds the
+    # index of each item inside the heap (or -1 when the item is not in it), so keys can be
+    # lowered in place instead of pushing a second copy of the item
+    __slots__ = ('key', 'pos')
+
+    def __init__(self, size, compact=False):
+        # Set up an empty binary heap with room for every item. With compact the three lists are
+        # typed arrays instead, 4 or 8 bytes a slot rather than a pointer plus an int or float
+        # object; walking them is a little slower, since every read makes a new number object.
+        # Compact keys are doubles, and keyOf gives infinity for items never inserted
+        self.arity = 2
+        self.bottomUp = False
+        self.heapSize = 0
+        if compact:
+            if size < 2 ** 31:
+                typecode = 'i'
+            else:
+                typecode = 'q'
+            self.heap = typedArray(typecode, [0]) * size
+            self.key = typedArray('d', [float('inf')]) * size
+            self.pos = typedArray(typecode, [-1]) * size
+        else:
+            self.heap = [0] * size
+            self.key = [None] * size
+            self.pos = [-1] * size
+
+    def contains(self, item):
+        # Returns if the item is currently in the heap
+        return self.pos[item] != -1
+
+    def keyOf(self, item):
+        # Returns the current key of the item, or None if it was never inserted
+        return self.key[item]
+
+    def lessThan(self, itemA, itemB):
+        # Compares two items by key, breaking ties on the item number like a (key, item) tuple would
+        keyA = self.key[itemA]
+        keyB = self.key[itemB]
+        return keyA < keyB or (keyA == keyB and itemA < itemB)
+
+    def swap(self, posA, posB):
+        # Swaps the items at the two heap positions and records their new positions
+        itemA = self.heap[posA]
+        itemB = self.heap[posB]
+        self.heap[posA] = itemB
+        self.heap[posB] = itemA
+        self.pos[itemB] = posA
+        self.pos[itemA] = posB
+
+    def insert(self, item, key):
+        # Puts a new item at the end of the heap and walks it up to its place
+        if self.pos[item] != -1:
+            raise ValueError("Item " + str(item) + " is already in the heap")
+        self.key[item] = key
+        self.heap[self.heapSize] = item
+        self.pos[item] = self.heapSize
+        self.heapSize = self.heapSize + 1
+        self.walkUp(self.heapSize - 1)
 
-        elif self.heap[lchildPos] < self.heap[rchildPos]:
-            return rchildPos
+    def decreaseKey(self, item, key):
+        # Lowers the key of the item and walks it up, inserting it if it is not in the heap yet.
+        # Returns False, changing nothing, if the new key is not smaller than the current one
+        if self.pos[item] == -1:
+            self.insert(item, key)
+            return True
+        if not key < self.key[item]:
+            return False
+        self.key[item] = key
+        self.walkUp(self.pos[item])
+        return True
 
+    def lookUpMin(self):
+        # Returns the (item, key) pair at the root, or prints Empty Heap if there is nothing in it
+        if self.heapSize == 0:
+            print("Empty Heap")
         else:
-            return lchildPos
+            item = self.heap[0]
+            return item, self.key[item]
+
+    def popMin(self):
+        # Takes away the root, moves the last item up to the root and walks it down.
+        # Returns the removed (item, key) pair
+        if self.heapSize == 0:
+            print("Empty Heap")
+            return None
+        item = self.heap[0]
+        self.heapSize = self.heapSize - 1
+        if self.heapSize > 0:
+            self.swap(0, self.heapSize)
+            self.walkDown(0)
+        self.pos[item] = -1
+        return item, self.key[item]
+
+    def lookUpLargest(self):
+        # The max-heap methods from Heap would read or move items without updating pos and key,
+        # so they are turned off; use lookUpMin and popMin instead
+        raise TypeError("IndexedHeap is a min-heap; use lookUpMin instead of lookUpLargest")
+
+    def deleteLargest(self):
+        raise TypeError("IndexedHeap is a min-heap; use popMin instead of deleteLargest")
+
+    def replaceLargest(self, val):
+        raise TypeError("IndexedHeap is a min-heap; use popMin and insert instead of replaceLargest")
+
+    def walkUp(self, startPos):
+        # Moves the item at startPos up past every parent with a larger key. This is the hot loop
+        # of PrimMST, so the lists are bound to locals, lessThan is written out inline, and
+        # parents move down into the hole instead of being swapped
+        heap = self.heap
+        key = self.key
+        pos = self.pos
+        item = heap[startPos]
+        itemKey = key[item]
+        currPos = startPos
+        while currPos > 0:
+            parentPos = (currPos - 1) >> 1
+            parent = heap[parentPos]
+            parentKey = key[parent]
+            if itemKey < parentKey or (itemKey == parentKey and item < parent):
+                heap[currPos] = parent
+                pos[parent] = currPos
+                currPos = parentPos
+            else:
+                break
+        heap[currPos] = item
+        pos[item] = currPos
+
+    def walkDown(self, startPos):
+        # Moves the item at startPos down past every smaller child, written out like walkUp
+        heap = self.heap
+        key = self.key
+        pos = self.pos
+        size = self.heapSize
+        item = heap[startPos]
+        itemKey = key[item]
+        currPos = startPos
+        childPos = 2 * currPos + 1
+        while childPos < size:
+            child = heap[childPos]
+            childKey = key[child]
+            rightPos = childPos + 1
+            if rightPos < size:
+                right = heap[rightPos]
+                rightKey = key[right]
+                if rightKey < childKey or (rightKey == childKey and right < child):
+                    childPos = rightPos
+                    child = right
+                    childKey = rightKey
+            if childKey < itemKey or (childKey == itemKey and child < item):
+                heap[currPos] = child
+                pos[child] = currPos
+                currPos = childPos
+                childPos = 2 * currPos + 1
+            else:
+                break
+        heap[currPos] = item
+        pos[item] = currPos
+
+    def capacity(self):
+        # Returns how many items the heap has room for, which is fixed at the size it was made with
+        return len(self.pos)
+
+    def shrink(self):
+        # Does nothing: the storage holds one slot per item number, and insert writes into those
+        # slots directly, so none of them can be given back
+        pass
+
+    def pushMany(self, entries):
+        # Inserts many (item, key) pairs at once. Like Heap.pushMany, a batch at least as big as
+        # the heap is dropped in at the end and the whole heap rebuilt, in O(n) instead of O(k log n)
+        entries = list(entries)
+        if len(entries) < self.heapSize:
+            for (item, key) in entries:
+                self.insert(item, key)
+            return
+        pos = self.pos
+        # Check the whole batch first, so a bad entry leaves the heap as it was
+        seen = set()
+        for (item, key) in entries:
+            if pos[item] != -1 or item in seen:
+                raise ValueError("Item " + str(item) + " is already in the heap")
+            seen.add(item)
+        for (item, key) in entries:
+            self.key[item] = key
+            self.heap[self.heapSize] = item
+            pos[item] = self.heapSize
+            self.heapSize = self.heapSize + 1
+        for r in range((self.heapSize - 2) >> 1, -1, -1):
+            self.walkDown(r)
+
+
+class PriorityQueue:
+    # A general-purpose binary priority queue, smallest priority first by default or largest
+    # first with maxHeap=True. Priorities and items sit in two parallel lists, so only the
+    # priorities are ever compared and nothing is wrapped in a tuple. The walk loops are plain
+    # functions picked once for the ordering, with everything bound to locals, so a push or pop
+    # makes no method calls while it walks. Equal priorities come out in no particular order
+    __slots__ = ('keys', 'items', 'maxHeap', 'siftUp', 'siftDown')
 
+    def __init__(self, maxHeap=False):
+        self.keys = []
+        self.items = []
+        self.maxHeap = maxHeap
+        if maxHeap:
+            self.siftUp = siftUpMax
+            self.siftDown = siftDownMax
+        else:
+            self.siftUp = siftUpMin
+            self.siftDown = siftDownMin
+
+    def __len__(self):
+        return len(self.keys)
+
+    def isEmpty(self):
+        # Returns if the queue is empty
+        return len(self.keys) == 0
+
+    def push(self, item, priority=None):
+        # Adds an item. Without a priority the item is its own priority
+        if priority is None:
+            priority = item
+        self.keys.append(priority)
+        self.items.append(item)
+        self.siftUp(self.keys, self.items, len(self.keys) - 1)
+
+    def pop(self):
+        # Takes the first item out of the queue and returns it
+        keys = self.keys
+        items = self.items
+        if not keys:
+            raise IndexError("pop from an empty priority queue")
+        lastKey = keys.pop()
+        lastItem = items.pop()
+        if not keys:
+            return lastItem
+        first = items[0]
+        keys[0] = lastKey
+        items[0] = lastItem
+        self.siftDown(keys, items, 0)
+        return first
+
+    def peek(self):
+        # Returns the first item without taking it out
+        if not self.keys:
+            raise IndexError("peek at an empty priority queue")
+        return self.items[0]
+
+    def peekPriority(self):
+        # Returns the priority of the first item
+        if not self.keys:
+            raise IndexError("peek at an empty priority queue")
+        return self.keys[0]
+
+    def pushpop(self, item, priority=None):
+        # Pushes the item and then pops, in one walk at most. If the new item would come out
+        # first anyway it is handed straight back without touching the heap
+        if priority is None:
+            priority = item
+        keys = self.keys
+        if not keys:
+            return item
+        if self.maxHeap:
+            comesFirst = not keys[0] > priority
+        else:
+            comesFirst = not keys[0] < priority
+        if comesFirst:
+            return item
+        first = self.items[0]
+        keys[0] = priority
+        self.items[0] = item
+        self.siftDown(keys, self.items, 0)
+        return first
+
+    def replace(self, item, priority=None):
+        # Pops the first item and then pushes the new one, in one walk. Unlike pushpop the
+        # returned item is always one that was already in the queue
+        if priority is None:
+            priority = item
+        if not self.keys:
+            raise IndexError("replace on an empty priority queue")
+        first = self.items[0]
+        self.keys[0] = priority
+        self.items[0] = item
+        self.siftDown(self.keys, self.items, 0)
+        return first
+
+
+def siftUpMin(keys, items, pos):
+    # Moves the entry at pos up a min-heap, parents moving down into the hole
+    key = keys[pos]
+    item = items[pos]
+    while pos > 0:
+        parentPos = (pos - 1) >> 1
+        parentKey = keys[parentPos]
+        if key < parentKey:
+            keys[pos] = parentKey
+            items[pos] = items[parentPos]
+            pos = parentPos
+        else:
+            break
+    keys[pos] = key
+    items[pos] = item
+
+
+def siftDownMin(keys, items, pos):
+    # Moves the entry at pos down a min-heap, smaller children moving up into the hole
+    size = len(keys)
+    key = keys[pos]
+    item = items[pos]
+    childPos = 2 * pos + 1
+    while childPos < size:
+        rightPos = childPos + 1
+        if rightPos < size and keys[rightPos] < keys[childPos]:
+            childPos = rightPos
+        childKey = keys[childPos]
+        if childKey < key:
+            keys[pos] = childKey
+            items[pos] = items[childPos]
+            pos = childPos
+            childPos = 2 * pos + 1
+        else:
+            break
+    keys[pos] = key
+    items[pos] = item
+
+
+def siftUpMax(keys, items, pos):
+    # Moves the entry at pos up a max-heap, parents moving down into the hole
+    key = keys[pos]
+    item = items[pos]
+    while pos > 0:
+        parentPos = (pos - 1) >> 1
+        parentKey = keys[parentPos]
+        if key > parentKey:
+            keys[pos] = parentKey
+            items[pos] = items[parentPos]
+            pos = parentPos
+        else:
+            break
+    keys[pos] = key
+    items[pos] = item
+
+
+def siftDownMax(keys, items, pos):
+    # Moves the entry at pos down a max-heap, larger children moving up into the hole
+    size = len(keys)
+    key = keys[pos]
+    item = items[pos]
+    childPos = 2 * pos + 1
+    while childPos < size:
+        rightPos = childPos + 1
+        if rightPos < size and keys[rightPos] > keys[childPos]:
+            childPos = rightPos
+        childKey = keys[childPos]
+        if childKey > key:
+            keys[pos] = childKey
+            items[pos] = items[childPos]
+            pos = childPos
+            childPos = 2 * pos + 1
+        else:
+            break
+    keys[pos] = key
+    items[pos] = item
+
+
+class KeyedHeap(Heap):
+    # A max-heap of items ordered by key(item) rather than by the items themselves. Each key is
+    # worked out once, when its item comes in, and stored next to it as a (key, count, item)
+    # entry. The count is unique per entry, so ties on the key never fall through to comparing
+    # the items, which do not have to be comparable at all
+    __slots__ = ('key', 'count')
+
+    def __init__(self, items, key, arity=2, bottomUp=False):
+        # Set up the heap from a list of items and the function that gives each one's key
+        self.key = key
+        self.count = len(items)
+        Heap.__init__(self, [(key(items[i]), i, items[i]) for i in range(len(items))], arity, bottomUp)
+
+    def lookUpLargest(self):
+        # Returns the item with the largest key. Or prints Empty Heap if there is no elements in it
+        if self.heapSize == 0:
+            print("Empty Heap")
+        else:
+            return self.heap[0][2]
+
+    def entryFor(self, val):
+        # Works out the key of a new item and pairs it with the next count
+        entry = (self.key(val), self.count, val)
+        self.count = self.count + 1
+        return entry
+
+    def insert(self, val):
+        # Works out the key of the new item and inserts it
+        Heap.insert(self, self.entryFor(val))
+
+    def replaceLargest(self, val):
+        # Swaps the item with the largest key for a new item, returning the old one
+        return Heap.replaceLargest(self, self.entryFor(val))[2]
+
+
+class ReverseOrder:
+    # Wraps a value so that it compares the other way round, which lets the max-heap Heap
+    # act as a min-heap
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __gt__(self, other):
+        return other.value > self.value
+
+
+class BoundedHeap(Heap):
+    # Keeps the best k items offered to it: the k smallest by default, or the k largest. The root
+    # is always the worst item kept, so a new item only has to beat the root to get in, and then
+    # simply replaces it. Memory stays at k entries however many items are offered. Keys are
+    # computed once per offered item, and equal keys favour the item offered first
+    __slots__ = ('limit', 'largest', 'keyFunc', 'count')
+
+    def __init__(self, k, largest=False, key=None, arity=2):
+        if k < 0:
+            raise ValueError("BoundedHeap capacity must not be negative")
+        self.limit = k
+        self.largest = largest
+        self.keyFunc = key
+        self.count = 0
+        Heap.__init__(self, [], arity)
+
+    def entryFor(self, item):
+        # Decorates an item so that the worst kept item is the largest entry
+        if self.keyFunc is None:
+            key = item
+        else:
+            key = self.keyFunc(item)
+        self.count = self.count + 1
+        if self.largest:
+            return ReverseOrder((key, -self.count, item))
+        return (key, self.count, item)
 
-def heapSort(array):
+    def offer(self, item):
+        # Considers one item, keeping it if it is among the best k seen so far
+        if self.limit == 0:
+            return
+        entry = self.entryFor(item)
+        if self.heapSize < self.limit:
+            self.insert(entry)
+        elif entry < self.heap[0]:
+            self.replaceLargest(entry)
+
+    def offerAll(self, iterable):
+        # Considers every item of an iterable, which is read one item at a time
+        for item in iterable:
+            self.offer(item)
+
+    def pushMany(self, values):
+        # Offers every value, so the heap keeps its limit and stores decorated entries
+        self.offerAll(values)
+
+    def drain(self):
+        # Empties the heap, returning the kept items best first
+        items = []
+        while not self.isEmpty():
+            entry = self.lookUpLargest()
+            if self.largest:
+                entry = entry.value
+            items.append(entry[2])
+            self.deleteLargest()
+        items.reverse()
+        return items
+
+
+def topK(iterable, k, largest=False, key=None):
+    # Reads any iterable (a generator is fine) and yields its k smallest items in increasing
+    # order, or its k largest in decreasing order. Takes O(n log k) time and O(k) memory
+    heap = BoundedHeap(k, largest, key)
+    heap.offerAll(iterable)
+    for item in heap.drain():
+        yield item
+
+
+def heapSortIter(iterable, key=None, reverse=False, arity=2):
+    # Yields the items of an iterable in sorted order, one at a time. Building the heap takes O(n)
+    # and each item after that costs O(log n) as it is asked for, so taking the first few items
+    # of a big input is much cheaper than sorting all of it. The sort is stable
+    items = list(iterable)
+    if key is None:
+        keys = items
+    else:
+        keys = [key(item) for item in items]
+    if reverse:
+        entries = [(keys[i], -i) for i in range(len(items))]
+    else:
+        # Reversed entries turn the max-heap into a min-heap, so the smallest comes out first
+        entries = [ReverseOrder((keys[i], i)) for i in range(len(items))]
+    del keys
+    heap = Heap(entries, arity)
+    while not heap.isEmpty():
+        entry = heap.lookUpLargest()
+        heap.deleteLargest()
+        if reverse:
+            yield items[-entry[1]]
+        else:
+            yield items[entry.value[1]]
+
+
+class HeapStats:
+    # Counters for seeing what the heaps and PrimMST actually do. Nothing counts unless a
+    # HeapStats is passed in: that switches to the Instrumented heap classes below (or to the
+    # instrumented PrimMST loop), so the plain classes and loops carry no counting code at all.
+    # Walks move a hole rather than swapping, so swaps counts elements moved one level
+    __slots__ = ('comparisons', 'swaps', 'pushes', 'pops', 'decreaseKeys', 'stalePops',
+                 'edgesScanned', 'edgesRelaxed', 'neighborBytesCopied', 'phaseTimes')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        # Sets every counter back to zero and forgets the phase timings
+        self.comparisons = 0
+        self.swaps = 0
+        self.pushes = 0
+        self.pops = 0
+        self.decreaseKeys = 0
+        self.stalePops = 0
+        self.edgesScanned = 0
+        self.edgesRelaxed = 0
+        self.neighborBytesCopied = 0
+        self.phaseTimes = {}
+
+    def addTime(self, phase, seconds):
+        # Adds time spent in the named phase
+        self.phaseTimes[phase] = self.phaseTimes.get(phase, 0.0) + seconds
+
+    def startPhase(self):
+        # Returns the current time, to hand to endPhase when the phase is over
+        return time.perf_counter()
+
+    def endPhase(self, phase, started):
+        # Charges the time since started (from startPhase) to the named phase
+        self.addTime(phase, time.perf_counter() - started)
+
+    def asDict(self):
+        # Returns the counters and phase timings as a plain dictionary
+        result = {}
+        for name in HeapStats.__slots__:
+            result[name] = getattr(self, name)
+        result['phaseTimes'] = dict(self.phaseTimes)
+        return result
+
+    def __repr__(self):
+        return "HeapStats(" + str(self.asDict()) + ")"
+
+
+class InstrumentedHeap(Heap):
+    # A Heap that counts its comparisons, swaps, pushes and pops in a HeapStats. The walks are the
+    # same as Heap's with counting added
+    __slots__ = ('stats',)
+
+    def __init__(self, Array, arity=2, bottomUp=False, stats=None):
+        if stats is None:
+            stats = HeapStats()
+        self.stats = stats
+        Heap.__init__(self, Array, arity, bottomUp)
+
+    def insert(self, val):
+        self.stats.pushes += 1
+        Heap.insert(self, val)
+
+    def entryFor(self, val):
+        # Only pushMany's rebuild path comes through here, so each value is counted once
+        self.stats.pushes += 1
+        return Heap.entryFor(self, val)
+
+    def deleteLargest(self):
+        self.stats.pops += 1
+        Heap.deleteLargest(self)
+
+    def replaceLargest(self, val):
+        self.stats.pushes += 1
+        self.stats.pops += 1
+        return Heap.replaceLargest(self, val)
+
+    def walkUp(self, startPos):
+        stats = self.stats
+        heap = self.heap
+        item = heap[startPos]
+        currPos = startPos
+        parentPos = self.parentOf(currPos)
+        while currPos > 0:
+            stats.comparisons += 1
+            if not item > heap[parentPos]:
+                break
+            heap[currPos] = heap[parentPos]
+            stats.swaps += 1
+            currPos = parentPos
+            parentPos = self.parentOf(currPos)
+        heap[currPos] = item
+
+    def walkDown(self, startPos):
+        if self.bottomUp:
+            self.walkDownBottomUp(startPos)
+            return
+        stats = self.stats
+        heap = self.heap
+        item = heap[startPos]
+        currPos = startPos
+        bigChildPos = self.findLargerChild(currPos)
+        while bigChildPos != -1:
+            stats.comparisons += 1
+            if not item < heap[bigChildPos]:
+                break
+            heap[currPos] = heap[bigChildPos]
+            stats.swaps += 1
+            currPos = bigChildPos
+            bigChildPos = self.findLargerChild(currPos)
+        heap[currPos] = item
+
+    def walkDownBottomUp(self, startPos):
+        stats = self.stats
+        heap = self.heap
+        item = heap[startPos]
+        leafPos = startPos
+        childPos = self.findLargerChild(leafPos)
+        while childPos != -1:
+            leafPos = childPos
+            childPos = self.findLargerChild(leafPos)
+
+        pos = leafPos
+        while pos != startPos:
+            stats.comparisons += 1
+            if not heap[pos] < item:
+                break
+            pos = self.parentOf(pos)
+        carry = heap[pos]
+        heap[pos] = item
+        while pos != startPos:
+            pos = self.parentOf(pos)
+            temp = heap[pos]
+            heap[pos] = carry
+            stats.swaps += 1
+            carry = temp
+
+    def findLargerChild(self, pos):
+        lchildPos = self.leftChildOf(pos)
+        if lchildPos < self.heapSize:
+            self.stats.comparisons += min(self.arity, self.heapSize - lchildPos) - 1
+        return Heap.findLargerChild(self, pos)
+
+
+class InstrumentedIndexedHeap(IndexedHeap):
+    # An IndexedHeap that counts its comparisons (of keys), swaps, pushes, pops and lowered keys
+    # in a HeapStats. The walks are the same as IndexedHeap's with counting added
+    __slots__ = ('stats',)
+
+    def __init__(self, size, compact=False, stats=None):
+        if stats is None:
+            stats = HeapStats()
+        self.stats = stats
+        IndexedHeap.__init__(self, size, compact)
+
+    def insert(self, item, key):
+        self.stats.pushes += 1
+        IndexedHeap.insert(self, item, key)
+
+    def decreaseKey(self, item, key):
+        # An item not yet in the heap gets inserted, which counts as a push instead
+        wasIn = self.pos[item] != -1
+        if wasIn:
+            self.stats.comparisons += 1
+        lowered = IndexedHeap.decreaseKey(self, item, key)
+        if lowered and wasIn:
+            self.stats.decreaseKeys += 1
+        return lowered
+
+    def popMin(self):
+        if self.heapSize > 0:
+            self.stats.pops += 1
+        return IndexedHeap.popMin(self)
+
+    def pushMany(self, entries):
+        # A small batch goes through insert, which counts its own pushes
+        entries = list(entries)
+        if len(entries) >= self.heapSize:
+            self.stats.pushes += len(entries)
+        IndexedHeap.pushMany(self, entries)
+
+    def walkUp(self, startPos):
+        stats = self.stats
+        heap = self.heap
+        key = self.key
+        pos = self.pos
+        item = heap[startPos]
+        itemKey = key[item]
+        currPos = startPos
+        while currPos > 0:
+            parentPos = (currPos - 1) >> 1
+            parent = heap[parentPos]
+            parentKey = key[parent]
+            stats.comparisons += 1
+            if itemKey < parentKey or (itemKey == parentKey and item < parent):
+                heap[currPos] = parent
+                pos[parent] = currPos
+                stats.swaps += 1
+                currPos = parentPos
+            else:
+                break
+        heap[currPos] = item
+        pos[item] = currPos
+
+    def walkDown(self, startPos):
+        stats = self.stats
+        heap = self.heap
+        key = self.key
+        pos = self.pos
+        size = self.heapSize
+        item = heap[startPos]
+        itemKey = key[item]
+        currPos = startPos
+        childPos = 2 * currPos + 1
+        while childPos < size:
+            child = heap[childPos]
+            childKey = key[child]
+            rightPos = childPos + 1
+            if rightPos < size:
+                right = heap[rightPos]
+                rightKey = key[right]
+                stats.comparisons += 1
+                if rightKey < childKey or (rightKey == childKey and right < child):
+                    childPos = rightPos
+                    child = right
+                    childKey = rightKey
+            stats.comparisons += 1
+            if childKey < itemKey or (childKey == itemKey and child < item):
+                heap[currPos] = child
+                pos[child] = currPos
+                stats.swaps += 1
+                currPos = childPos
+                childPos = 2 * currPos + 1
+            else:
+                break
+        heap[currPos] = item
+        pos[item] = currPos
+
+
+def heapSort(array, arity=2, bottomUp=False, key=None, reverse=False, stats=None):
     # Takes in an array and heap sort it and returns an array with increasing order
-    heap = Heap(array)
+    # arity and bottomUp choose the kind of Heap to sort with. key and reverse work like they
+    # do for the built-in sorted: key(element) is what gets compared, and reverse gives
+    # decreasing order. Passing a HeapStats sorts with an InstrumentedHeap that fills it in,
+    # timing the build and extract phases (numeric arrays then skip their faster path)
+    if key is not None or reverse:
+        return keyedHeapSort(array, key, reverse, arity, bottomUp, stats)
+    if stats is not None:
+        started = stats.startPhase()
+        heap = InstrumentedHeap(array, arity, bottomUp, stats)
+        stats.endPhase('build', started)
+        started = stats.startPhase()
+        for i in range(heap.heapSize - 1, -1, -1):
+            temp = heap.lookUpLargest()
+            heap.deleteLargest()
+            array[i] = temp
+        stats.endPhase('extract', started)
+        return array
+    if isNumericArray(array):
+        return numericHeapSort(array, arity, bottomUp)
+    heap = Heap(array, arity, bottomUp)
     for i in range(heap.heapSize - 1, -1, -1):
         temp = heap.lookUpLargest()
         heap.deleteLargest()
         array[i] = temp
     return array
 
-array = [0,15,2,3,1,4]
-print(heapSort(array))
+def isNumericArray(array):
+    # Returns if the array is a NumPy ndarray or an array.array, whose elements are boxed into
+    # new Python objects every time they are indexed
+    if isinstance(array, typedArray):
+        return True
+    return np is not None and isinstance(array, np.ndarray) and array.ndim == 1
+
+
+def numericHeapSort(array, arity=2, bottomUp=False):
+    # Heap sorts a one-dimensional ndarray or array.array in place. Rather than indexing the array
+    # element by element, the values are pulled out into a list in one call, the heap work is
+    # done on that list, and the sorted values are written back in one call at the end.
+    # For a plain binary heap on an ndarray, the heap is built with whole levels of the tree at
+    # a time (vectorHeapify); other kinds of heap sort the list with a Heap
+    if arity != 2 or bottomUp:
+        values = heapSort(array.tolist(), arity, bottomUp)
+    else:
+        if np is not None and isinstance(array, np.ndarray):
+            values = vectorHeapify(array.copy()).tolist()
+        else:
+            values = array.tolist()
+            for r in range(len(values) // 2 - 1, -1, -1):
+                siftDownList(values, r, len(values))
+
+        # Repeatedly move the largest value to the end of the shrinking heap
+        for end in range(len(values) - 1, 0, -1):
+            largest = values[0]
+            values[0] = values[end]
+            values[end] = largest
+            siftDownList(values, 0, end)
+
+    return writeBack(array, values)
+
+
+def keyedHeapSort(array, key, reverse, arity=2, bottomUp=False, stats=None):
+    # Decorate-sort-undecorate. Each element's key is computed exactly once, and paired with
+    # the element's position; the pairs are heap sorted, and the elements are put back in the
+    # order of their pairs. Because the position breaks ties, equal keys keep their original
+    # order (so the sort is stable) and the elements themselves are never compared
+    values = list(array)
+    if key is None:
+        keys = values
+    else:
+        keys = [key(value) for value in values]
+    if reverse:
+        # Negated positions, so that reversing at the end keeps equal keys in their original order
+        decorated = [(keys[i], -i) for i in range(len(values))]
+    else:
+        decorated = [(keys[i], i) for i in range(len(values))]
+    heapSort(decorated, arity, bottomUp, stats=stats)
+    if reverse:
+        decorated.reverse()
+        return writeBack(array, [values[-i] for (k, i) in decorated])
+    return writeBack(array, [values[i] for (k, i) in decorated])
+
+
+def writeBack(array, values):
+    # Copies the sorted values over the contents of the array in one go, and returns the array
+    if isinstance(array, typedArray):
+        array[:] = typedArray(array.typecode, values)
+    else:
+        array[:] = values
+    return array
+
+
+def siftDownList(values, pos, size):
+    # Walks the value at pos down the max-heap values[0:size]. The value is held aside while
+    # larger children move up into the hole, and is written once where it belongs, instead of
+    # being swapped at every level
+    item = values[pos]
+    child = 2 * pos + 1
+    while child < size:
+        right = child + 1
+        if right < size and values[child] < values[right]:
+            child = right
+        if not item < values[child]:
+            break
+        values[pos] = values[child]
+        pos = child
+        child = 2 * pos + 1
+    values[pos] = item
+
+
+def vectorHeapify(values):
+    # Turns the ndarray values into a max-heap in place and returns it. The nodes on one level of
+    # the tree have separate subtrees, so all of them can walk down together: each step compares
+    # every walking node with its larger child in one NumPy operation and swaps the ones that
+    # are out of order, from the lowest level with children up to the root
+    size = len(values)
+    if size < 2:
+        return values
+    lastParent = size // 2 - 1
+    # Node i sits on level floor(log2(i + 1)) of the tree
+    level = (lastParent + 1).bit_length() - 1
+    while level >= 0:
+        pos = np.arange(2 ** level - 1, min(2 ** (level + 1) - 1, lastParent + 1))
+        while pos.size > 0:
+            child = 2 * pos + 1
+            right = child + 1
+            hasRight = right < size
+            pickRight = np.zeros(pos.size, dtype=bool)
+            pickRight[hasRight] = values[right[hasRight]] > values[child[hasRight]]
+            child[pickRight] = right[pickRight]
+            moving = values[pos] < values[child]
+            pos = pos[moving]
+            child = child[moving]
+            temp = values[pos]
+            values[pos] = values[child]
+            values[child] = temp
+            pos = child[2 * child + 1 < size]
+        level -= 1
+    return values
+
+
+class RecordFormat:
+    # Reads and writes fixed-size binary records in bulk. A single array typecode such as 'd' or 'q'
+    # means plain numbers, read straight into an array.array; anything else is a struct format,
+    # and each record comes back as a tuple of its fields
+    def __init__(self, fmt):
+        if len(fmt) == 1 and fmt in typecodes:
+            self.typecode = fmt
+            self.size = typedArray(fmt).itemsize
+        else:
+            self.typecode = None
+            self.struct = struct.Struct(fmt)
+            self.size = self.struct.size
+
+    def read(self, f, count):
+        # Reads up to count records from the file, fewer only at the end of the file
+        if self.typecode is not None:
+            records = typedArray(self.typecode)
+            try:
+                records.fromfile(f, count)
+            except EOFError:
+                # fromfile keeps the records it did manage to read
+                pass
+            return records
+        data = f.read(count * self.size)
+        if len(data) % self.size != 0:
+            raise ValueError("File ends partway through a " + str(self.size) + "-byte record")
+        return list(self.struct.iter_unpack(data))
+
+    def write(self, f, records):
+        # Writes a list or array of records to the file in one go
+        if self.typecode is not None:
+            if not isinstance(records, typedArray):
+                records = typedArray(self.typecode, records)
+            records.tofile(f)
+        else:
+            f.write(b"".join([self.struct.pack(*record) for record in records]))
+
+
+class RunReader:
+    # A cursor over one sorted run file, reading bufferRecords records at a time
+    def __init__(self, path, recordFormat, bufferRecords):
+        self.file = open(path, 'rb')
+        self.recordFormat = recordFormat
+        self.bufferRecords = bufferRecords
+        self.buffer = []
+        self.pos = 0
+
+    def next(self):
+        # Returns the next record of the run, or None when the run is used up
+        if self.pos == len(self.buffer):
+            self.buffer = self.recordFormat.read(self.file, self.bufferRecords)
+            self.pos = 0
+            if len(self.buffer) == 0:
+                self.file.close()
+                return None
+        record = self.buffer[self.pos]
+        self.pos = self.pos + 1
+        return record
+
+
+def externalHeapSort(inputPaths, outputPath, recordFormat='d', runRecords=1 << 22, key=None,
+                     bufferRecords=1 << 14, maxFanIn=256, tempDir=None):
+    # Sorts binary files of fixed-size records that are too big to fit in memory, writing the
+    # result to outputPath. The input is cut into runs of runRecords records, each run is heap
+    # sorted in memory and spilled to a temporary file, and the runs are then merged with an
+    # IndexedHeap holding one cursor per run. All reads and writes go bufferRecords records at a
+    # time. If there are more than maxFanIn runs, they are merged in several passes so that
+    # not too many files are open at once. Returns the number of records sorted
+    # recordFormat: an array typecode for plain numbers, or a struct format for records
+    # key: optional function of a record to sort by; by default whole records are compared
+    if isinstance(inputPaths, str):
+        inputPaths = [inputPaths]
+    if maxFanIn < 2:
+        raise ValueError("maxFanIn must be at least 2")
+    fmt = RecordFormat(recordFormat)
+    workDir = tempfile.mkdtemp(prefix="heapsort-", dir=tempDir)
+    try:
+        runs = []
+        total = 0
+        for path in inputPaths:
+            with open(path, 'rb') as inputFile:
+                while True:
+                    records = fmt.read(inputFile, runRecords)
+                    if len(records) == 0:
+                        break
+                    total = total + len(records)
+                    heapSort(records, key=key)
+                    runPath = os.path.join(workDir, "run" + str(len(runs)))
+                    with open(runPath, 'wb') as runFile:
+                        fmt.write(runFile, records)
+                    runs.append(runPath)
+                    del records
+
+        # Merge groups of runs into longer runs until one pass can finish the job
+        passNumber = 0
+        while len(runs) > maxFanIn:
+            merged = []
+            for i in range(0, len(runs), maxFanIn):
+                runPath = os.path.join(workDir, "pass" + str(passNumber) + "-" + str(len(merged)))
+                mergeRuns(runs[i:i + maxFanIn], runPath, fmt, key, bufferRecords)
+                merged.append(runPath)
+            for runPath in runs:
+                os.remove(runPath)
+            runs = merged
+            passNumber = passNumber + 1
+        mergeRuns(runs, outputPath, fmt, key, bufferRecords)
+        return total
+    finally:
+        shutil.rmtree(workDir, ignore_errors=True)
+
+
+def mergeRuns(runPaths, outputPath, fmt, key, bufferRecords):
+    # k-way merges sorted run files into outputPath. The IndexedHeap is keyed by each run's
+    # current record (or its key), with ties going to the earlier run, so the merge is stable
+    readers = [RunReader(runPath, fmt, bufferRecords) for runPath in runPaths]
+    current = [None] * len(readers)
+    heap = IndexedHeap(len(readers))
+    for r in range(len(readers)):
+        record = readers[r].next()
+        if record is not None:
+            current[r] = record
+            heap.insert(r, record if key is None else key(record))
+
+    with open(outputPath, 'wb') as outputFile:
+        out = []
+        while not heap.isEmpty():
+            r = heap.popMin()[0]
+            out.append(current[r])
+            if len(out) == bufferRecords:
+                fmt.write(outputFile, out)
+                out = []
+            record = readers[r].next()
+            if record is not None:
+                current[r] = record
+                heap.insert(r, record if key is None else key(record))
+        fmt.write(outputFile, out)
+
+
+if __name__ == "__main__":
+    array = [0,15,2,3,1,4]
+    print(heapSort(array))
 
-array2 = [9,2,3,8,4,10,1]
-print(heapSort(array2))
+    array2 = [9,2,3,8,4,10,1]
+    print(heapSort(array2))
 
-array3 = [0,1000,9992,382,123,4382,584,2394,384,2384,574]
-print(heapSort(array3))
+    array3 = [0,1000,9992,382,123,4382,584,2394,384,2384,574]
+    print(heapSort(array3))
 
-array4 = [0,372,392,485,753,2,1,4,2384,574]
-print(heapSort(array4))
+    array4 = [0,372,392,485,753,2,1,4,2384,574]
+    print(heapSort(array4))
 
-array5 = [1,2,3,4,5,6,7,8]
-print(heapSort(array5))
\ No newline at end of file
+    array5 = [1,2,3,4,5,6,7,8]
+    print(heapSort(array5))